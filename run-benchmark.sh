@@ -0,0 +1,4 @@
+#!/bin/bash
+# Benchmark the solutions
+
+python3 solutions/benchmark.py "$@"
@@ -2,7 +2,7 @@
 
 exit_usage() {
     cat <<EOF
-Usage: $0 [ -h ] [ -e ] [ -v ] [ date ]
+Usage: $0 [ -h ] [ -e ] [ -m ] [ -v ] [ date ]
 
 Positional argument:
     date
@@ -13,6 +13,8 @@ Options:
         Show this help message and exit
     -e
         Use example data instead of the real puzzle data
+    -m
+        Memory-map the input file instead of reading it at once
     -v
         Show debug messages
 
@@ -22,8 +24,9 @@ EOF
 
 example_data="false"
 verbose=""
+mmap=""
 
-while getopts ":hev" opt ; do
+while getopts ":hemv" opt ; do
     case $opt in
         h)
             exit_usage
@@ -31,6 +34,9 @@ while getopts ":hev" opt ; do
         e)
             example_data="true"
             ;;
+        m)
+            mmap="-m"
+            ;;
         v)
             verbose="-v"
             ;;
@@ -54,7 +60,7 @@ else
     data_file="inputs/${day}.txt"
 fi
 
-command="$(echo solutions/day${day}.py ${verbose} "${data_file}")"
+command="$(echo solutions/day${day}.py ${verbose} ${mmap} "${data_file}")"
 
 echo "Running command: ${command}"
 echo
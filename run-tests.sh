@@ -1,4 +1,10 @@
 #!/bin/bash
 # Run unittests
+# (in parallel using tests/parallel_runner.py if the first option is -j)
 
-PYTHONPATH=solutions python3 -m unittest discover "$@"
+if [ "$1" = "-j" ] ; then
+    shift
+    PYTHONPATH=solutions python3 -m tests.parallel_runner "$@"
+else
+    PYTHONPATH=solutions python3 -m unittest discover "$@"
+fi
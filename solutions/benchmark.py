@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Advent of code 2021
+Benchmark blackstream-x’ solutions:
+run part1 and part2 of each day repeatedly
+and write the timings to a JSON file
+"""
+
+
+import argparse
+import datetime
+import importlib.util
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import helpers
+
+
+#
+# Constants
+#
+
+
+RETURNCODE_OK = 0
+RETURNCODE_ERROR = 1
+
+DEFAULT_OUTPUT_FILE = "benchmark-results.json"
+DEFAULT_ENGINES_OUTPUT_FILE = "benchmark-engines.json"
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 10
+
+TESTS_DIRECTORY = "tests"
+
+PARTS = (1, 2)
+
+
+#
+# Functions
+#
+
+
+def percentile(sorted_values, percent):
+    """Return the percentile (nearest rank method)
+    from the sorted values
+    """
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+
+def serializable(answer):
+    """Return the answer in a JSON serializable form"""
+    if answer is None or isinstance(answer, (int, float, str)):
+        return answer
+    #
+    return repr(answer)
+
+
+def measure(func, reader, repeat=DEFAULT_REPEAT):
+    """Run func(reader) repeatedly and return a dict
+    containing timing statistics, peak memory and the answer
+    """
+    # Bypass the timer decorator’s logging if possible
+    func = getattr(func, "__wrapped__", func)
+    timings = []
+    answer = None
+    for _ in range(repeat):
+        # Measure each part including the parsing of its input
+        reader.parse_cache.clear()
+        start = time.perf_counter_ns()
+        answer = func(reader)
+        timings.append(time.perf_counter_ns() - start)
+    #
+    # Measure memory in a separate run because tracing
+    # slows down execution considerably
+    reader.parse_cache.clear()
+    tracemalloc.start()
+    try:
+        func(reader)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    #
+    timings.sort()
+    return dict(
+        runs=repeat,
+        min_ns=timings[0],
+        median_ns=int(statistics.median(timings)),
+        p95_ns=percentile(timings, 95),
+        peak_memory_bytes=peak_memory,
+        answer=serializable(answer),
+    )
+
+
+def benchmark_day(day, repeat=DEFAULT_REPEAT, example=False):
+    """Benchmark all parts of the day,
+    yield (key, result) tuples
+    """
+    try:
+        module = helpers.load_solution(day)
+    except ImportError as error:
+        logging.warning("Skipping day %s: %s", day, error)
+        return
+    #
+    file_name = helpers.input_file_name(day, example=example)
+    try:
+        reader = helpers.Reader(file_name=file_name)
+    except OSError as error:
+        logging.warning("Skipping day %s: %s", day, error)
+        return
+    #
+    for part in PARTS:
+        try:
+            func = getattr(module, f"part{part}")
+        except AttributeError:
+            continue
+        #
+        logging.debug("Benchmarking day %s part %s ...", day, part)
+        result = measure(func, reader, repeat=repeat)
+        result.update(day=day, part=part)
+        yield f"day{day}.part{part}", result
+    #
+
+
+def compare_day_engines(day, repeat=DEFAULT_REPEAT, example=False):
+    """Run the engine comparison provided by the day’s
+    compare_engines(reader) function, if any,
+    and return a list of result rows using the minimum time
+    of the repeated runs
+    """
+    try:
+        module = helpers.load_solution(day)
+        compare_engines = module.compare_engines
+    except (ImportError, AttributeError):
+        return []
+    #
+    reader = helpers.Reader(
+        file_name=helpers.input_file_name(day, example=example)
+    )
+    rows = {}
+    for _ in range(repeat):
+        for row in compare_engines(reader):
+            key = (row["case"], row["engine"])
+            if key in rows:
+                rows[key]["nanoseconds"] = min(
+                    rows[key]["nanoseconds"], row["nanoseconds"]
+                )
+            else:
+                rows[key] = dict(row, day=day)
+            #
+        #
+    #
+    return list(rows.values())
+
+
+def check_engine_answers(rows):
+    """Compare the answers of all engines for each day and case,
+    return the list of (day, case) tuples where the engines disagree
+    """
+    answers = {}
+    for row in rows:
+        answers.setdefault((row["day"], row["case"]), {})[row["engine"]] = (
+            row["answer"]
+        )
+    #
+    disagreements = []
+    for (day, case), engine_answers in answers.items():
+        if len(set(engine_answers.values())) > 1:
+            logging.error(
+                "Day %s, %s: the engines disagree: %s",
+                day,
+                case,
+                ", ".join(
+                    f"{engine}={answer!r}"
+                    for engine, answer in engine_answers.items()
+                ),
+            )
+            disagreements.append((day, case))
+        #
+    #
+    return disagreements
+
+
+def print_engines_table(rows):
+    """Print the engine comparison results as a table"""
+    extra_keys = sorted(
+        {key for row in rows for key in row}
+        - {"day", "case", "engine", "answer", "nanoseconds"}
+    )
+    print(
+        f"{'Day':>4} {'Case':<16} {'Engine':<16} {'Answer':>18} {'ms':>12}"
+        + "".join(f" {key:>12}" for key in extra_keys)
+    )
+    for row in rows:
+        print(
+            f"{row['day']:>4} {row['case']:<16} {row['engine']:<16}"
+            f" {str(row['answer']):>18} {format_msec(row['nanoseconds']):>12}"
+            + "".join(f" {str(row.get(key, '')):>12}" for key in extra_keys)
+        )
+    #
+
+
+def expected_results(day, example=False):
+    """Return the expected results of the day’s parts
+    as defined in tests/test_N.py, as a dict
+    """
+    file_name = os.path.join(TESTS_DIRECTORY, f"test_{day}.py")
+    spec = importlib.util.spec_from_file_location(f"test_{day}", file_name)
+    test_module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(test_module)
+    except (ImportError, OSError) as error:
+        logging.warning("No expected results for day %s: %s", day, error)
+        return {}
+    #
+    kind = "EXAMPLE" if example else "PUZZLE"
+    try:
+        results = getattr(test_module, f"{kind}_RESULTS")
+    except AttributeError:
+        # Older test modules define one constant per part
+        results = [
+            getattr(test_module, f"PART_{part}_{kind}_RESULT", None)
+            for part in PARTS
+        ]
+    #
+    return dict(zip(PARTS, results))
+
+
+def check_answers(results, example=False):
+    """Compare the answers with the expected results,
+    return the list of keys with wrong answers
+    """
+    wrong_answers = []
+    expectations = {}
+    for key, result in results.items():
+        day = result["day"]
+        if day not in expectations:
+            expectations[day] = expected_results(day, example=example)
+        #
+        expected = expectations[day].get(result["part"])
+        if expected is None:
+            continue
+        #
+        if result["answer"] != serializable(expected):
+            logging.error(
+                "%s: wrong answer %r, expected %r",
+                key,
+                result["answer"],
+                expected,
+            )
+            wrong_answers.append(key)
+        #
+    #
+    return wrong_answers
+
+
+def compare_with_baseline(
+    results, baseline, threshold=DEFAULT_THRESHOLD, days=None
+):
+    """Compare median timings and answers with the baseline,
+    return the list of keys that got slower by more than
+    threshold percent, changed their answers,
+    or are in the baseline for one of the days
+    (default: all days) but missing from the results
+    """
+    regressions = []
+    for key, result in results.items():
+        try:
+            old_result = baseline[key]
+        except KeyError:
+            logging.info("%s: not in baseline", key)
+            continue
+        #
+        if result["answer"] != old_result["answer"]:
+            logging.error(
+                "%s: answer changed from %r to %r",
+                key,
+                old_result["answer"],
+                result["answer"],
+            )
+            regressions.append(key)
+            continue
+        #
+        old_median = old_result["median_ns"]
+        new_median = result["median_ns"]
+        change = 100 * (new_median - old_median) / max(old_median, 1)
+        message = (
+            f"{key}: median {format_msec(old_median)} ms"
+            f" → {format_msec(new_median)} ms ({change:+.1f}%)"
+        )
+        if change > threshold:
+            message = f"{message} – REGRESSION"
+            regressions.append(key)
+        #
+        print(message)
+    #
+    for key, old_result in baseline.items():
+        if key in results:
+            continue
+        #
+        if days is not None and old_result["day"] not in days:
+            continue
+        #
+        logging.error("%s: in baseline but missing from the results", key)
+        regressions.append(key)
+    #
+    return regressions
+
+
+def format_msec(nanoseconds):
+    """Format nanoseconds as milliseconds"""
+    return f"{nanoseconds / 1000000:.3f}"
+
+
+def print_table(results):
+    """Print the results as a table"""
+    print(
+        f"{'Part':<14} {'min ms':>12} {'median ms':>12} {'p95 ms':>12}"
+        f" {'peak KiB':>10}"
+    )
+    for key, result in results.items():
+        print(
+            f"{key:<14} {format_msec(result['min_ns']):>12}"
+            f" {format_msec(result['median_ns']):>12}"
+            f" {format_msec(result['p95_ns']):>12}"
+            f" {result['peak_memory_bytes'] // 1024:>10}"
+        )
+    #
+
+
+def write_output(arguments, **data):
+    """Write the data to the JSON output file"""
+    output = dict(
+        created=datetime.datetime.now().isoformat(timespec="seconds"),
+        python=sys.version.split()[0],
+        example=arguments.example,
+        repeat=arguments.repeat,
+        **data,
+    )
+    with open(
+        arguments.output_file, mode="wt", encoding="utf-8"
+    ) as output_file:
+        json.dump(output, output_file, indent=2)
+    #
+    logging.info("Wrote results to %s", arguments.output_file)
+
+
+#
+# Main
+#
+
+
+def main():
+    """Parse arguments and run the benchmark"""
+    main_parser = argparse.ArgumentParser(
+        prog=sys.argv[0],
+        description="Advent of Code solutions benchmark",
+    )
+    main_parser.set_defaults(loglevel=logging.WARNING)
+    main_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_const",
+        const=logging.DEBUG,
+        dest="loglevel",
+        help="output all messages including debug level",
+    )
+    main_parser.add_argument(
+        "-e",
+        "--example",
+        action="store_true",
+        help="use the example data instead of the puzzle data",
+    )
+    main_parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="number of timed runs per part (default: %(default)s)",
+    )
+    main_parser.add_argument(
+        "-o",
+        "--output-file",
+        help="write the results to this JSON file (default:"
+        f" {DEFAULT_OUTPUT_FILE}, or {DEFAULT_ENGINES_OUTPUT_FILE}"
+        " when comparing engines)",
+    )
+    main_parser.add_argument(
+        "-b",
+        "--baseline",
+        metavar="BASELINE_FILE",
+        help="compare the results with a previously written JSON file"
+        " and exit with a non-zero returncode on regressions",
+    )
+    main_parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        help="maximum accepted slowdown of the median time in percent"
+        f" when comparing with a baseline (default: {DEFAULT_THRESHOLD})",
+    )
+    main_parser.add_argument(
+        "-c",
+        "--compare-engines",
+        action="store_true",
+        help="instead of timing the parts, compare the alternative"
+        " engines of the days providing a compare_engines() function",
+    )
+    main_parser.add_argument(
+        "days",
+        nargs="*",
+        type=int,
+        help="benchmark only these days (default: all days)",
+    )
+    arguments = main_parser.parse_args()
+    logging.basicConfig(
+        level=arguments.loglevel,
+        format="%(levelname)-8s | %(message)s",
+    )
+    if arguments.repeat < 1:
+        main_parser.error("Please repeat at least once!")
+    #
+    if arguments.compare_engines:
+        if arguments.baseline or arguments.threshold is not None:
+            main_parser.error(
+                "Comparing engines cannot be combined"
+                " with a baseline comparison!"
+            )
+        #
+        if not arguments.output_file:
+            arguments.output_file = DEFAULT_ENGINES_OUTPUT_FILE
+        #
+    else:
+        if arguments.threshold is None:
+            arguments.threshold = DEFAULT_THRESHOLD
+        elif not arguments.baseline:
+            main_parser.error("A threshold requires a baseline file!")
+        #
+        if not arguments.output_file:
+            arguments.output_file = DEFAULT_OUTPUT_FILE
+        #
+    #
+    # Always measure parsing instead of loading cached parse results
+    helpers.PERSISTENT_PARSE_CACHE = False
+    baseline = None
+    if arguments.baseline:
+        with open(
+            arguments.baseline, mode="rt", encoding="utf-8"
+        ) as baseline_file:
+            baseline_data = json.load(baseline_file)
+        #
+        if baseline_data.get("example", False) != arguments.example:
+            main_parser.error(
+                "The baseline was recorded with"
+                f" {'example' if baseline_data.get('example') else 'puzzle'}"
+                " data, please use the same data for comparison!"
+            )
+        #
+        if baseline_data.get("repeat") != arguments.repeat:
+            logging.warning(
+                "The baseline was recorded with %s runs per part"
+                " instead of %s, timings may not be comparable",
+                baseline_data.get("repeat"),
+                arguments.repeat,
+            )
+        #
+        baseline = baseline_data["results"]
+    #
+    days = arguments.days or helpers.solution_days()
+    if arguments.compare_engines:
+        rows = []
+        for day in days:
+            rows.extend(
+                compare_day_engines(
+                    day, repeat=arguments.repeat, example=arguments.example
+                )
+            )
+        #
+        print_engines_table(rows)
+        write_output(arguments, engines=rows)
+        if check_engine_answers(rows):
+            return RETURNCODE_ERROR
+        #
+        return RETURNCODE_OK
+    #
+    results = {}
+    for day in days:
+        for key, result in benchmark_day(
+            day, repeat=arguments.repeat, example=arguments.example
+        ):
+            results[key] = result
+        #
+    #
+    print_table(results)
+    write_output(arguments, results=results)
+    returncode = RETURNCODE_OK
+    if check_answers(results, example=arguments.example):
+        returncode = RETURNCODE_ERROR
+    #
+    if baseline is not None:
+        regressions = compare_with_baseline(
+            results, baseline, threshold=arguments.threshold, days=days
+        )
+        if regressions:
+            logging.error(
+                "%s of %s parts regressed: %s",
+                len(regressions),
+                len(results),
+                ", ".join(regressions),
+            )
+            returncode = RETURNCODE_ERROR
+        #
+    #
+    return returncode
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# vim: fileencoding=utf-8 sw=4 ts=4 sts=4 expandtab autoindent syntax=python:
@@ -4,124 +4,280 @@
 """
 Advent of code 2021, day 11
 blackstream-x’ solution
+
+Provides an additional NumPy based grid engine if NumPy is available
+(pip install --user numpy)
 """
 
 
 import logging
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+#
+
 import helpers
 
 
+# Energy level at which an octopus flashes
+FLASH_LEVEL = 10
+
+INCREASE_ENERGY = bytes((level + 1) & 0xFF for level in range(256))
+RESET_FLASHED = bytes(
+    0 if level >= FLASH_LEVEL else level for level in range(256)
+)
+LEVEL_DIGITS = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+
 class OctopusGrid:
 
-    """Grid of flashing dumbo octopuses"""
+    """Grid of flashing dumbo octopuses,
+    stored row by row in a flat bytearray of energy levels.
+    The neighbor indices of each octopus are precomputed
+    in a table, and flashes are propagated using a stack
+    that is reused in every step.
+    """
 
     def __init__(self):
         """Initialize grid"""
-        self.__grid = {}
+        self.__levels = bytearray()
+        self.__neighbors = None
+        self.__stack = []
+        self.width = 0
         self.total_flashes = 0
         self.lines = 0
-        self.__about_to_flash = set()
 
     @property
     def size(self):
         """Return grid size"""
-        return len(self.__grid)
+        return len(self.__levels)
 
     def add_line(self, line):
         """Add a line to the grid"""
-        for (index, level) in enumerate(line):
-            self.__grid[(index, self.lines)] = int(level)
+        if self.lines and len(line) != self.width:
+            raise ValueError("All lines must have the same length!")
         #
+        self.__levels.extend(int(level) for level in line)
+        self.width = len(line)
         self.lines += 1
+        self.__neighbors = None
 
     def draw(self):
         """Draw the grid: yield all lines"""
-        for y_pos in range(self.lines):
-            current_line = []
-            x_pos = 0
-            while True:
-                try:
-                    current_line.append(str(self.__grid[(x_pos, y_pos)]))
-                except KeyError:
-                    yield "".join(current_line)
-                    break
-                #
-                x_pos += 1
-            #
+        for start in range(0, self.size, self.width):
+            yield self.__levels[start:start + self.width].translate(
+                LEVEL_DIGITS
+            ).decode()
         #
 
-    def __increase_energy(self, position):
-        """Increase energy level of the octopus at position by 1"""
-        try:
-            new_level = self.__grid[position] + 1
-        except KeyError:
-            return
-        #
-        self.__grid[position] = new_level
-        if new_level > 9:
-            self.__about_to_flash.add(position)
-        #
-
-    def __flash(self, position):
-        """Increase energy level of all position’s neighbors"""
-        pos_x, pos_y = position
-        for x_index in range(pos_x - 1, pos_x + 2):
-            for y_index in range(pos_y - 1, pos_y + 2):
-                if x_index != pos_x or y_index != pos_y:
-                    self.__increase_energy((x_index, y_index))
-                #
+    def __build_neighbors_table(self):
+        """Return a tuple containing a tuple of neighbor indices
+        for each octopus in the grid
+        """
+        neighbors = []
+        for y_pos in range(self.lines):
+            for x_pos in range(self.width):
+                neighbors.append(
+                    tuple(
+                        y_index * self.width + x_index
+                        for y_index in range(
+                            max(y_pos - 1, 0), min(y_pos + 2, self.lines)
+                        )
+                        for x_index in range(
+                            max(x_pos - 1, 0), min(x_pos + 2, self.width)
+                        )
+                        if x_index != x_pos or y_index != y_pos
+                    )
+                )
             #
         #
+        return tuple(neighbors)
 
     def step(self):
         """Increase energy levels of each octopus in the grid
-        and flash if determined by the individual energy levels
+        and flash if determined by the individual energy levels.
+        Return the number of flashes in this step.
         """
-        logging.debug("Calculating step...")
+        if self.__neighbors is None:
+            self.__neighbors = self.__build_neighbors_table()
+        #
+        neighbors = self.__neighbors
+        stack = self.__stack
         # Increase energy levels
-        for position in self.__grid:
-            self.__increase_energy(position)
-        #
-        # Flash in iterations op primary and induced flashes
-        have_flashed = set()
-        imminent_flashes = self.__about_to_flash - have_flashed
-        self.__about_to_flash.clear()
-        while imminent_flashes:
-            for position in imminent_flashes:
-                self.__flash(position)
-                have_flashed.add(position)
+        levels = self.__levels.translate(INCREASE_ENERGY)
+        index = levels.find(FLASH_LEVEL)
+        while index >= 0:
+            stack.append(index)
+            index = levels.find(FLASH_LEVEL, index + 1)
+        #
+        # Propagate primary and induced flashes.
+        # Each octopus reaches the flash level exactly once
+        # and is pushed to the stack at that moment;
+        # its level may rise above the flash level afterwards
+        # (at most by 8), so the bytearray cannot overflow.
+        while stack:
+            for neighbor in neighbors[stack.pop()]:
+                new_level = levels[neighbor] + 1
+                levels[neighbor] = new_level
+                if new_level == FLASH_LEVEL:
+                    stack.append(neighbor)
+                #
             #
-            logging.debug("Flash iteration: %s flashes", len(imminent_flashes))
-            imminent_flashes = self.__about_to_flash - have_flashed
-            self.__about_to_flash.clear()
         #
         # Reset energy levels of each flashed octopus
-        for position in have_flashed:
-            self.__grid[position] = 0
-        #
-        self.total_flashes += len(have_flashed)
-        return len(have_flashed)
+        self.__levels = levels.translate(RESET_FLASHED)
+        # After the increase, only flashed octopuses are at level 0
+        flashes = self.__levels.count(0)
+        self.total_flashes += flashes
+        return flashes
 
     def total_flashes_after(self, total_steps):
         """Return the number of flashes after total_steps"""
         for dummy_step_number in range(total_steps):
             self.step()
         #
-        logging.debug("Grid after %s steps:", total_steps)
-        for line in self.draw():
-            logging.debug(line)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Grid after %s steps:", total_steps)
+            for line in self.draw():
+                logging.debug(line)
+            #
         #
         return self.total_flashes
 
+    def first_synchronized_step(self):
+        """Step until all octopuses flash simultaneously,
+        return the number of that step
+        """
+        size = self.size
+        step_number = 1
+        while self.step() != size:
+            step_number += 1
+        #
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Grid after %s steps:", step_number)
+            for line in self.draw():
+                logging.debug(line)
+            #
+        #
+        return step_number
+
+
+class NumpyOctopusGrid(OctopusGrid):
+
+    """Grid of flashing dumbo octopuses,
+    stored in a 2-dimensional NumPy uint8 array.
+    Each step increases all energy levels with one array addition
+    and spreads the flashes by adding the 3x3 neighborhood sums
+    of the newly flashed octopuses (computed from nine shifted views
+    of the padded flash mask) until no new flashes occur.
+    """
+
+    def __init__(self):
+        """Initialize grid"""
+        super().__init__()
+        self.__added_rows = []
+        self.__levels = numpy.zeros((0, 0), dtype=numpy.uint8)
+        self.__padded_flashes = None
+
+    @property
+    def levels(self):
+        """The energy levels as a 2-dimensional array (rows first)"""
+        if self.__added_rows:
+            self.__levels = numpy.array(self.__added_rows, dtype=numpy.uint8)
+            self.__added_rows.clear()
+            self.__padded_flashes = None
+        #
+        return self.__levels
+
+    @property
+    def size(self):
+        """Return grid size"""
+        return self.levels.size
+
+    def add_line(self, line):
+        """Add a line to the grid"""
+        if self.lines and len(line) != self.width:
+            raise ValueError("All lines must have the same length!")
+        #
+        if not self.__added_rows and self.__levels.size:
+            self.__added_rows.extend(self.__levels.tolist())
+        #
+        self.__added_rows.append([int(level) for level in line])
+        self.width = len(line)
+        self.lines += 1
+
+    def draw(self):
+        """Draw the grid: yield all lines"""
+        for row in self.levels.tolist():
+            yield "".join(str(level) for level in row)
+        #
+
+    def step(self):
+        """Increase energy levels of each octopus in the grid
+        and flash if determined by the individual energy levels.
+        Return the number of flashes in this step.
+        """
+        levels = self.levels
+        if self.__padded_flashes is None:
+            self.__padded_flashes = numpy.zeros(
+                (self.lines + 2, self.width + 2), dtype=numpy.uint8
+            )
+        #
+        padded_flashes = self.__padded_flashes
+        levels += 1
+        have_flashed = numpy.zeros(levels.shape, dtype=bool)
+        new_flashes = levels >= FLASH_LEVEL
+        while new_flashes.any():
+            have_flashed |= new_flashes
+            padded_flashes[1:-1, 1:-1] = new_flashes
+            # The center is included in the neighborhood sum,
+            # but it only increases levels of flashed octopuses
+            # which are reset at the end of the step anyway
+            for y_offset in range(3):
+                for x_offset in range(3):
+                    levels += padded_flashes[
+                        y_offset:y_offset + self.lines,
+                        x_offset:x_offset + self.width,
+                    ]
+                #
+            #
+            new_flashes = (levels >= FLASH_LEVEL) & ~have_flashed
+        #
+        levels[have_flashed] = 0
+        flashes = int(numpy.count_nonzero(have_flashed))
+        self.total_flashes += flashes
+        return flashes
+
+
+ENGINES = {"flat": OctopusGrid}
+if numpy is not None:
+    ENGINES["numpy"] = NumpyOctopusGrid
+#
+
+DEFAULT_ENGINE = "flat"
+
+
+@helpers.cached_parser
+def parse_grid(reader):
+    """Return the lines of the octopus grid as a tuple"""
+    return tuple(reader.lines())
+
+
+def load_grid(reader, engine=DEFAULT_ENGINE):
+    """Return the octopus grid, using the engine selected by name"""
+    grid = ENGINES[engine]()
+    for line in parse_grid(reader):
+        grid.add_line(line)
+    #
+    return grid
+
 
 @helpers.timer
 def part1(reader):
     """Part 1"""
-    grid = OctopusGrid()
-    for line in reader.lines():
-        grid.add_line(line)
-    #
+    grid = load_grid(reader)
     logging.debug("Grid at start time:")
     for line in grid.draw():
         logging.debug(line)
@@ -132,26 +288,12 @@ def part1(reader):
 @helpers.timer
 def part2(reader):
     """Part 2"""
-    grid = OctopusGrid()
-    for line in reader.lines():
-        grid.add_line(line)
-    #
+    grid = load_grid(reader)
     logging.debug("Grid at start time:")
     for line in grid.draw():
         logging.debug(line)
     #
-    step_number = 1
-    while True:
-        if grid.step() == grid.size:
-            break
-        #
-        step_number += 1
-    #
-    logging.debug("Grid after %s steps:", step_number)
-    for line in grid.draw():
-        logging.debug(line)
-    #
-    return step_number
+    return grid.first_synchronized_step()
 
 
 if __name__ == "__main__":
@@ -10,172 +10,317 @@ solution part 1 is ripped off from
 """
 
 
+import array
+import collections
 import heapq
 import logging
+import time
 
 import helpers
 
 
+# Number of buckets for the bucket queue: maximum risk level + 1
+NUMBER_OF_BUCKETS = 10
+
+DEFAULT_ENGINE = "bucket"
+
+
 class ChitonDensityMap:
 
-    """Map of Chiton density"""
+    """Map of Chiton density,
+    stored in a flat bytearray indexed by y * width + x
+    """
 
     start_point = (0, 0)
 
     def __init__(self):
         """Initialize grid"""
-        self.matrix = {}
+        self.risks = bytearray()
         self.height = 0
         self.width = 0
 
     def add_line(self, line):
         """Add a line to the map"""
-        for (index, density) in enumerate(line):
-            self.matrix[(index, self.height)] = int(density)
+        if self.height and len(line) != self.width:
+            raise ValueError("All lines must have the same length!")
         #
-        self.width = max(self.width, len(line))
+        self.risks.extend(int(density) for density in line)
+        self.width = len(line)
         self.height += 1
 
-    def neighbors(self, position):
-        """Yield all horizontal and vertical
-        neighbor positions if inside the matrix
+    @property
+    def end_point(self):
+        """The bottom right corner"""
+        return (self.width - 1, self.height - 1)
+
+    def index(self, position):
+        """Return the cell index of the position.
+        Raise a ValueError if the position is outside the map.
         """
         x_pos, y_pos = position
+        if not (0 <= x_pos < self.width and 0 <= y_pos < self.height):
+            raise ValueError(
+                f"Position {position} is outside the"
+                f" {self.width}x{self.height} map"
+            )
+        #
+        return y_pos * self.width + x_pos
+
+    def position(self, index):
+        """Return the position of the cell index"""
+        y_pos, x_pos = divmod(index, self.width)
+        return (x_pos, y_pos)
+
+    def neighbors(self, index):
+        """Yield the cell indices of all horizontal and vertical
+        neighbors inside the matrix
+        """
+        x_pos = index % self.width
         # left neighbor
         if x_pos > 0:
-            yield (x_pos - 1, y_pos)
+            yield index - 1
         #
         # right neighbor
         if x_pos < self.width - 1:
-            yield (x_pos + 1, y_pos)
+            yield index + 1
         #
         # upper neighbor
-        if y_pos > 0:
-            yield (x_pos, y_pos - 1)
+        if index >= self.width:
+            yield index - self.width
         #
         # lower neighbor
-        if y_pos < self.height - 1:
-            yield (x_pos, y_pos + 1)
+        if index < (self.height - 1) * self.width:
+            yield index + self.width
         #
 
 
-def get_heap_based_cost(matrix):
-    """Return minimum path cost using a binary heap
+class TiledRisks:
+
+    """Read-only sequence of the risk levels in a map tiled
+    from a base map, computed on the fly from the base map’s risks
+    """
+
+    def __init__(self, base_map, factor):
+        """Keep a reference to the base map risks"""
+        self.base_risks = base_map.risks
+        self.base_width = base_map.width
+        self.base_height = base_map.height
+        self.width = base_map.width * factor
+        self.size = self.width * base_map.height * factor
+
+    def __len__(self):
+        """Number of cells"""
+        return self.size
+
+    def __getitem__(self, index):
+        """Risk level of the cell: the base risk level,
+        increased by the tile distance from the top left tile,
+        wrapping around from 9 to 1
+        """
+        y_pos, x_pos = divmod(index, self.width)
+        tile_y, base_y = divmod(y_pos, self.base_height)
+        tile_x, base_x = divmod(x_pos, self.base_width)
+        base_risk = self.base_risks[base_y * self.base_width + base_x]
+        return (base_risk + tile_x + tile_y - 1) % 9 + 1
+
+
+class TiledChitonDensityMap(ChitonDensityMap):
+
+    """Virtual map of Chiton density: the base map repeated
+    factor times in both directions as outlined in part 2.
+    Only the base map is held in memory.
+    """
+
+    def __init__(self, base_map, factor=5):
+        """Initialize the virtual grid"""
+        super().__init__()
+        self.risks = TiledRisks(base_map, factor)
+        self.width = base_map.width * factor
+        self.height = base_map.height * factor
+
+    def add_line(self, line):
+        """Tiled maps are read-only"""
+        raise TypeError("Lines can only be added to the base map")
+
+
+def get_heap_based_cost(matrix, stats=None):
+    """Return minimum path cost using a binary heap,
+    working directly on the cell indices of the flat risks array:
+    neighbors are reached by adding the offsets -1, +1, -width, +width
+    (after checking the borders), and visited cells are flagged
+    in a bytearray.
 
     ================================================================
     Measured times with this algorithm:
 
     Running command: solutions/day15.py inputs/15.txt
 
-    INFO     | Executed 'Part 1' in 80.100 msec (80100.3 µsec)
+    INFO     | Executed 'Part 1' in 43.579 msec (43578.7 µsec)
     652
-    INFO     | Executed 'Part 2' in 2321.449 msec (2321448.6 µsec)
+    INFO     | Executed 'Part 2' in 1324.326 msec (1324325.8 µsec)
     2938
+
+    (with the former dict-based map: 80.100 and 2321.449 msec)
     ================================================================
     """
-    end_point = (matrix.width - 1, matrix.height - 1)
-    visited = set()
-    work_heap = []
-    heapq.heappush(work_heap, (0, matrix.start_point))
+    risks = matrix.risks
+    width = matrix.width
+    last_x = width - 1
+    last_row_start = (matrix.height - 1) * width
+    end_index = matrix.index(matrix.end_point)
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    expanded = 0
+    visited = bytearray(width * matrix.height)
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    work_heap = [(0, matrix.index(matrix.start_point))]
     while work_heap:
-        cost, current_position = heapq.heappop(work_heap)
-        if current_position in visited:
+        cost, current_index = heappop(work_heap)
+        if visited[current_index]:
             continue
         #
-        logging.debug("Visiting position %r ...", current_position)
-        visited.add(current_position)
-        if current_position == end_point:
+        if debug:
+            logging.debug("Visiting cell #%r ...", current_index)
+        #
+        visited[current_index] = 1
+        expanded += 1
+        if current_index == end_index:
+            if stats is not None:
+                stats["expanded"] = expanded
+            #
             return cost
         #
-        for neighbor_position in matrix.neighbors(current_position):
-            # Never consider already visited psitions again
-            if neighbor_position in visited:
-                continue
+        # Never consider already visited positions again
+        x_pos = current_index % width
+        if x_pos > 0:
+            neighbor_index = current_index - 1
+            if not visited[neighbor_index]:
+                heappush(
+                    work_heap, (cost + risks[neighbor_index], neighbor_index)
+                )
+            #
+        #
+        if x_pos < last_x:
+            neighbor_index = current_index + 1
+            if not visited[neighbor_index]:
+                heappush(
+                    work_heap, (cost + risks[neighbor_index], neighbor_index)
+                )
+            #
+        #
+        if current_index >= width:
+            neighbor_index = current_index - width
+            if not visited[neighbor_index]:
+                heappush(
+                    work_heap, (cost + risks[neighbor_index], neighbor_index)
+                )
+            #
+        #
+        if current_index < last_row_start:
+            neighbor_index = current_index + width
+            if not visited[neighbor_index]:
+                heappush(
+                    work_heap, (cost + risks[neighbor_index], neighbor_index)
+                )
             #
-            heapq.heappush(
-                work_heap,
-                (cost + matrix.matrix[neighbor_position], neighbor_position),
-            )
         #
     #
 
 
-def get_set_based_cost(matrix):
+def get_set_based_cost(matrix, stats=None):
     """Return minimum path cost using a set
 
     ====================================================================
-    Measured times with this algorithm:
+    Measured times with this algorithm
+    (engine alone on the flat bytearray map, minimum of 3 runs
+    for part 1 and of 1 run for part 2):
 
-    Running command: solutions/day15.py inputs/15.txt
+    Part 1 (100x100): 206.5 msec
+    Part 2 (500x500): 30733.8 msec
 
-    INFO     | Executed 'Part 1' in 312.598 msec (312597.5 µsec)
-    652
-    INFO     | Executed 'Part 2' in 42630.289 msec (42630288.8 µsec)
-    2938
+    (with the former dict-based map, including parsing:
+    312.598 and 42630.289 msec)
     ====================================================================
     """
-    end_point = (matrix.width - 1, matrix.height - 1)
+    end_index = matrix.index(matrix.end_point)
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    expanded = 0
     visited = set()
-    work_area = set([(0, matrix.start_point)])
+    work_area = set([(0, matrix.index(matrix.start_point))])
     while work_area:
         cheapest = min(work_area)
         work_area.remove(cheapest)
-        cost, current_position = cheapest
-        if current_position in visited:
+        cost, current_index = cheapest
+        if current_index in visited:
             continue
         #
-        logging.debug("Visiting position %r ...", current_position)
-        visited.add(current_position)
-        if current_position == end_point:
+        if debug:
+            logging.debug("Visiting cell #%r ...", current_index)
+        #
+        visited.add(current_index)
+        expanded += 1
+        if current_index == end_index:
+            if stats is not None:
+                stats["expanded"] = expanded
+            #
             return cost
         #
-        for neighbor_position in matrix.neighbors(current_position):
-            # Never consider already visited psitions again
-            if neighbor_position in visited:
+        for neighbor_index in matrix.neighbors(current_index):
+            # Never consider already visited positions again
+            if neighbor_index in visited:
                 continue
             #
             work_area.add(
-                (cost + matrix.matrix[neighbor_position], neighbor_position)
+                (cost + matrix.risks[neighbor_index], neighbor_index)
             )
         #
     #
 
 
-def get_list_based_cost(matrix):
+def get_list_based_cost(matrix, stats=None):
     """Return minimum path cost using a plain list
 
     ====================================================================
-    Measured times with this algorithm:
+    Measured times with this algorithm
+    (engine alone on the flat bytearray map, minimum of 3 runs
+    for part 1 and of 1 run for part 2):
 
-    Running command: solutions/day15.py inputs/15.txt
+    Part 1 (100x100): 129.4 msec
+    Part 2 (500x500): 21995.2 msec
 
-    INFO     | Executed 'Part 1' in 291.281 msec (291281.2 µsec)
-    652
-    INFO     | Executed 'Part 2' in 42683.927 msec (42683927.3 µsec)
-    2938
+    (with the former dict-based map, including parsing:
+    291.281 and 42683.927 msec)
     ====================================================================
     """
-    end_point = (matrix.width - 1, matrix.height - 1)
+    end_index = matrix.index(matrix.end_point)
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    expanded = 0
     visited = set()
-    work_area = [(0, matrix.start_point)]
+    work_area = [(0, matrix.index(matrix.start_point))]
     while work_area:
         cheapest = work_area.pop(0)
-        cost, current_position = cheapest
-        if current_position in visited:
+        cost, current_index = cheapest
+        if current_index in visited:
             continue
         #
-        logging.debug("Visiting position %r ...", current_position)
-        visited.add(current_position)
-        if current_position == end_point:
+        if debug:
+            logging.debug("Visiting cell #%r ...", current_index)
+        #
+        visited.add(current_index)
+        expanded += 1
+        if current_index == end_index:
+            if stats is not None:
+                stats["expanded"] = expanded
+            #
             return cost
         #
-        for neighbor_position in matrix.neighbors(current_position):
-            # Never consider already visited psitions again
-            if neighbor_position in visited:
+        for neighbor_index in matrix.neighbors(current_index):
+            # Never consider already visited positions again
+            if neighbor_index in visited:
                 continue
             #
             neighbor_data = (
-                cost + matrix.matrix[neighbor_position], neighbor_position
+                cost + matrix.risks[neighbor_index], neighbor_index
             )
             if not work_area or neighbor_data > work_area[-1]:
                 work_area.append(neighbor_data)
@@ -191,56 +336,417 @@ def get_list_based_cost(matrix):
     #
 
 
-def blow_up(reader):
-    """Yield blown-up lines as outlined in part2 description"""
-    repeated_lines = []
-    for line in reader.lines():
-        repetitions = []
-        for increase in range(9):
-            repetitions.append([])
-        #
-        for item in line:
-            density = int(item)
-            for increase in range(9):
-                repetitions[increase].append((density - 1 + increase) % 9 + 1)
-            #
-        #
-        repeated_lines.append(
-            [
-                "".join([format(density) for density in block])
-                for block in repetitions
-            ]
-        )
+def get_bucket_based_cost(matrix, stats=None):
+    """Return minimum path cost using a bucket queue (Dial’s algorithm).
+    Risk levels are between 1 and 9, so all pending cells
+    cost between the current cost + 1 and the current cost + 9:
+    ten buckets (indexed by cost modulo 10) used in a circular fashion
+    hold all pending cells, making push and pop O(1) operations.
+    """
+    risks = matrix.risks
+    width = matrix.width
+    last_x = width - 1
+    last_row_start = (matrix.height - 1) * width
+    end_index = matrix.index(matrix.end_point)
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    expanded = 0
+    visited = bytearray(width * matrix.height)
+    buckets = [[] for _ in range(NUMBER_OF_BUCKETS)]
+    buckets[0].append(matrix.index(matrix.start_point))
+    pending = 1
+    cost = 0
+    while pending:
+        current_bucket = buckets[cost % NUMBER_OF_BUCKETS]
+        pending -= len(current_bucket)
+        while current_bucket:
+            current_index = current_bucket.pop()
+            if visited[current_index]:
+                continue
+            #
+            if debug:
+                logging.debug("Visiting cell #%r ...", current_index)
+            #
+            visited[current_index] = 1
+            expanded += 1
+            if current_index == end_index:
+                if stats is not None:
+                    stats["expanded"] = expanded
+                #
+                return cost
+            #
+            # Never consider already visited positions again
+            x_pos = current_index % width
+            if x_pos > 0:
+                neighbor_index = current_index - 1
+                if not visited[neighbor_index]:
+                    buckets[
+                        (cost + risks[neighbor_index]) % NUMBER_OF_BUCKETS
+                    ].append(neighbor_index)
+                    pending += 1
+                #
+            #
+            if x_pos < last_x:
+                neighbor_index = current_index + 1
+                if not visited[neighbor_index]:
+                    buckets[
+                        (cost + risks[neighbor_index]) % NUMBER_OF_BUCKETS
+                    ].append(neighbor_index)
+                    pending += 1
+                #
+            #
+            if current_index >= width:
+                neighbor_index = current_index - width
+                if not visited[neighbor_index]:
+                    buckets[
+                        (cost + risks[neighbor_index]) % NUMBER_OF_BUCKETS
+                    ].append(neighbor_index)
+                    pending += 1
+                #
+            #
+            if current_index < last_row_start:
+                neighbor_index = current_index + width
+                if not visited[neighbor_index]:
+                    buckets[
+                        (cost + risks[neighbor_index]) % NUMBER_OF_BUCKETS
+                    ].append(neighbor_index)
+                    pending += 1
+                #
+            #
+        #
+        cost += 1
     #
-    for _ in range(5):
-        for blocks in repeated_lines:
-            logging.debug(blocks)
-            yield "".join(blocks[:5])
-            blocks.pop(0)
+
+
+def get_astar_cost(matrix, stats=None):
+    """Return minimum path cost using the A* algorithm.
+    As each step costs at least 1, the manhattan distance
+    to the end point is an admissible (and consistent) estimate
+    of the remaining cost.
+    The heap holds (estimated total cost, cost, cell index) tuples.
+
+    ================================================================
+    Measured on the puzzle input (engine alone, minimum of 3 runs):
+
+    Part 2 map (500x500): 721.5 msec, 249999 cells expanded
+    (heap: 582.5 msec, 250000 cells; bucket: 288.6 msec, 249999 cells)
+
+    Risk levels average well above 1, so the estimate of 1 per step
+    is too weak to prune anything on this map, and computing it
+    makes this engine slower than the heap and bucket engines.
+    ================================================================
+    """
+    risks = matrix.risks
+    width = matrix.width
+    last_x = width - 1
+    last_y = matrix.height - 1
+    last_row_start = last_y * width
+    end_index = matrix.index(matrix.end_point)
+    debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+    expanded = 0
+    visited = bytearray(width * matrix.height)
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    start_index = matrix.index(matrix.start_point)
+    start_y, start_x = divmod(start_index, width)
+    work_heap = [(last_x - start_x + last_y - start_y, 0, start_index)]
+    while work_heap:
+        _, cost, current_index = heappop(work_heap)
+        if visited[current_index]:
+            continue
+        #
+        if debug:
+            logging.debug("Visiting cell #%r ...", current_index)
+        #
+        visited[current_index] = 1
+        expanded += 1
+        if current_index == end_index:
+            if stats is not None:
+                stats["expanded"] = expanded
+            #
+            return cost
+        #
+        # Never consider already visited positions again.
+        # Moving left or up increases the estimate by 1,
+        # moving right or down decreases it by 1.
+        y_pos, x_pos = divmod(current_index, width)
+        estimate = last_x - x_pos + last_y - y_pos
+        if x_pos > 0:
+            neighbor_index = current_index - 1
+            if not visited[neighbor_index]:
+                neighbor_cost = cost + risks[neighbor_index]
+                priority = neighbor_cost + estimate + 1
+                heappush(work_heap, (priority, neighbor_cost, neighbor_index))
+            #
+        #
+        if x_pos < last_x:
+            neighbor_index = current_index + 1
+            if not visited[neighbor_index]:
+                neighbor_cost = cost + risks[neighbor_index]
+                priority = neighbor_cost + estimate - 1
+                heappush(work_heap, (priority, neighbor_cost, neighbor_index))
+            #
+        #
+        if current_index >= width:
+            neighbor_index = current_index - width
+            if not visited[neighbor_index]:
+                neighbor_cost = cost + risks[neighbor_index]
+                priority = neighbor_cost + estimate + 1
+                heappush(work_heap, (priority, neighbor_cost, neighbor_index))
+            #
+        #
+        if current_index < last_row_start:
+            neighbor_index = current_index + width
+            if not visited[neighbor_index]:
+                neighbor_cost = cost + risks[neighbor_index]
+                priority = neighbor_cost + estimate - 1
+                heappush(work_heap, (priority, neighbor_cost, neighbor_index))
+            #
         #
     #
 
 
-@helpers.timer
-def part1(reader):
-    """Part 1"""
+ENGINES = {
+    "astar": get_astar_cost,
+    "bucket": get_bucket_based_cost,
+    "heap": get_heap_based_cost,
+    "set": get_set_based_cost,
+    "list": get_list_based_cost,
+}
+
+
+# Engines too slow for maps bigger than this number of cells
+SLOW_ENGINES = ("set", "list")
+SLOW_ENGINES_MAX_CELLS = 40000
+
+
+def get_cost(matrix, engine=DEFAULT_ENGINE, stats=None):
+    """Return minimum path cost using the engine selected by name.
+    If a stats dict is provided, the engine stores the number
+    of expanded cells in it (key "expanded").
+    """
+    return ENGINES[engine](matrix, stats=stats)
+
+
+def compare_engines(reader, engines=tuple(ENGINES), factors=(1, 2, 5)):
+    """Benchmark the path cost engines on the base map
+    and on tiled maps of growing size,
+    yield a dict with the results for each map and engine
+    """
+    base_map = parse_density_map(reader)
+    for factor in factors:
+        if factor == 1:
+            density_map = base_map
+        else:
+            density_map = TiledChitonDensityMap(base_map, factor)
+        #
+        cells = density_map.width * density_map.height
+        for engine in engines:
+            if engine in SLOW_ENGINES and cells > SLOW_ENGINES_MAX_CELLS:
+                continue
+            #
+            stats = {}
+            start = time.perf_counter_ns()
+            answer = get_cost(density_map, engine=engine, stats=stats)
+            yield dict(
+                case=f"{density_map.width}x{density_map.height}",
+                engine=engine,
+                answer=answer,
+                nanoseconds=time.perf_counter_ns() - start,
+                **stats,
+            )
+        #
+    #
+
+
+class PathFinder:
+
+    """Answer many (start, end) path cost queries on one map.
+    Single queries are answered using bidirectional Dijkstra.
+    From a start point queried repeatedly, the shortest path tree
+    (costs and predecessors of all cells) is computed once and cached,
+    so all further queries from there are simple lookups.
+    """
+
+    def __init__(self, matrix, tree_threshold=2, cache_size=8):
+        """Keep the map and initialize the tree cache"""
+        self.matrix = matrix
+        self.tree_threshold = tree_threshold
+        self.cache_size = cache_size
+        self.trees = collections.OrderedDict()
+        self.queries_per_start = collections.Counter()
+
+    def shortest_path_tree(self, start):
+        """Return (and cache) the shortest path tree from the start
+        position as a tuple of two arrays indexed by cell:
+        the minimum costs and the predecessors (-1 for the start cell)
+        """
+        start_index = self.matrix.index(start)
+        try:
+            self.trees.move_to_end(start_index)
+            return self.trees[start_index]
+        except KeyError:
+            pass
+        #
+        risks = self.matrix.risks
+        width = self.matrix.width
+        last_x = width - 1
+        cells = width * self.matrix.height
+        last_row = cells - width
+        costs = array.array("q", [-1]) * cells
+        predecessors = array.array("q", [-1]) * cells
+        costs[start_index] = 0
+        work_heap = [(0, start_index)]
+        visited = bytearray(cells)
+        while work_heap:
+            cost, current_index = heapq.heappop(work_heap)
+            if visited[current_index]:
+                continue
+            #
+            visited[current_index] = 1
+            x_pos = current_index % width
+            for neighbor_index in (
+                current_index - 1 if x_pos > 0 else -1,
+                current_index + 1 if x_pos < last_x else -1,
+                current_index - width if current_index >= width else -1,
+                current_index + width if current_index < last_row else -1,
+            ):
+                if neighbor_index < 0:
+                    continue
+                #
+                neighbor_cost = cost + risks[neighbor_index]
+                if costs[neighbor_index] < 0 or (
+                    neighbor_cost < costs[neighbor_index]
+                ):
+                    costs[neighbor_index] = neighbor_cost
+                    predecessors[neighbor_index] = current_index
+                    heapq.heappush(work_heap, (neighbor_cost, neighbor_index))
+                #
+            #
+        #
+        self.trees[start_index] = (costs, predecessors)
+        while len(self.trees) > self.cache_size:
+            self.trees.popitem(last=False)
+        #
+        return costs, predecessors
+
+    def path(self, start, end):
+        """Return the cheapest path from start to end
+        as a list of positions.
+        Raise a ValueError if either position is outside the map.
+        """
+        predecessors = self.shortest_path_tree(start)[1]
+        current_index = self.matrix.index(end)
+        reversed_path = []
+        while current_index >= 0:
+            reversed_path.append(self.matrix.position(current_index))
+            current_index = predecessors[current_index]
+        #
+        return reversed_path[::-1]
+
+    def bidirectional_cost(self, start_index, end_index):
+        """Return the minimum path cost between the cells
+        using bidirectional Dijkstra.
+        Entering a cell costs its risk level, so the backward search
+        adds the risk level of the cell it comes from.
+        """
+        risks = self.matrix.risks
+        width = self.matrix.width
+        last_x = width - 1
+        last_row = (self.matrix.height - 1) * width
+        costs = ({start_index: 0}, {end_index: 0})
+        settled = (set(), set())
+        heaps = ([(0, start_index)], [(0, end_index)])
+        best_cost = None
+        while heaps[0] and heaps[1]:
+            if best_cost is not None and (
+                heaps[0][0][0] + heaps[1][0][0] >= best_cost
+            ):
+                break
+            #
+            # Expand the direction with the cheaper next cell
+            direction = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            own_costs = costs[direction]
+            other_costs = costs[1 - direction]
+            cost, current_index = heapq.heappop(heaps[direction])
+            if current_index in settled[direction]:
+                continue
+            #
+            settled[direction].add(current_index)
+            x_pos = current_index % width
+            for neighbor_index in (
+                current_index - 1 if x_pos > 0 else -1,
+                current_index + 1 if x_pos < last_x else -1,
+                current_index - width if current_index >= width else -1,
+                current_index + width if current_index < last_row else -1,
+            ):
+                if neighbor_index < 0:
+                    continue
+                #
+                if direction:
+                    neighbor_cost = cost + risks[current_index]
+                else:
+                    neighbor_cost = cost + risks[neighbor_index]
+                #
+                known_cost = own_costs.get(neighbor_index)
+                if known_cost is None or neighbor_cost < known_cost:
+                    own_costs[neighbor_index] = neighbor_cost
+                    heapq.heappush(
+                        heaps[direction], (neighbor_cost, neighbor_index)
+                    )
+                #
+                try:
+                    total_cost = neighbor_cost + other_costs[neighbor_index]
+                except KeyError:
+                    continue
+                #
+                if best_cost is None or total_cost < best_cost:
+                    best_cost = total_cost
+                #
+            #
+        #
+        return best_cost
+
+    def cost(self, start, end):
+        """Return the minimum path cost from start to end.
+        Raise a ValueError if either position is outside the map.
+        """
+        start_index = self.matrix.index(start)
+        end_index = self.matrix.index(end)
+        if start_index == end_index:
+            return 0
+        #
+        self.queries_per_start[start_index] += 1
+        if (
+            start_index in self.trees
+            or self.queries_per_start[start_index] >= self.tree_threshold
+        ):
+            return self.shortest_path_tree(start)[0][end_index]
+        #
+        return self.bidirectional_cost(start_index, end_index)
+
+
+@helpers.cached_parser(persistent=True)
+def parse_density_map(reader):
+    """Return the chiton density map"""
     density_map = ChitonDensityMap()
     for line in reader.lines():
         density_map.add_line(line)
     #
-    return get_heap_based_cost(density_map)
-    # return get_set_based_cost(density_map)
+    return density_map
+
+
+@helpers.timer
+def part1(reader):
+    """Part 1"""
+    density_map = parse_density_map(reader)
+    return get_cost(density_map)
 
 
 @helpers.timer
 def part2(reader):
     """Part 2"""
-    density_map = ChitonDensityMap()
-    for line in blow_up(reader):
-        density_map.add_line(line)
-    #
-    return get_heap_based_cost(density_map)
-    # return get_set_based_cost(density_map)
+    density_map = TiledChitonDensityMap(parse_density_map(reader), 5)
+    return get_cost(density_map)
 
 
 if __name__ == "__main__":
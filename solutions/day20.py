@@ -4,10 +4,20 @@
 """
 Advent of code 2021, day 20
 blackstream-x’ solution
+
+Uses NumPy for enhancing the image if available
+(pip install --user numpy)
 """
 
 
 import logging
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+#
 
 import helpers
 
@@ -106,13 +116,397 @@ class InputImage:
             logging.info("".join(line).translate(BIN2OUTPUT))
         #
 
+    def lit_pixels(self):
+        """Return the number of lit pixels"""
+        return sum(self.matrix.values())
+
+
+class NumpyInputImage:
 
+    """Input image stored in a NumPy uint8 array.
+    Each enhancement computes the 9-bit enhancement indexes
+    of the whole image at once by combining nine shifted views
+    of the image padded with the infinity pixel value,
+    and looks all of them up in the enhancement table
+    with a single fancy-indexing operation.
+    As in the bit rows engine, only the bounding box of the pixels
+    differing from the infinity pixel value is stored
+    (its top left corner is at min_x, min_y),
+    and the cost of each enhancement step is recorded
+    in step_statistics.
+    """
+
+    def __init__(self, enhancement_algorithm):
+        """Initialize the image and the lookup table"""
+        self.enhancement_algorithm = enhancement_algorithm
+        self.lookup_table = numpy.array(
+            [(enhancement_algorithm >> index) & 1 for index in range(512)],
+            dtype=numpy.uint8,
+        )
+        self.infinity_value = 0
+        self.infinity_lookup = [
+            int(self.lookup_table[0]),
+            int(self.lookup_table[0b111111111]),
+        ]
+        self.__added_rows = []
+        self.__pixels = numpy.zeros((0, 0), dtype=numpy.uint8)
+        self.min_x = 0
+        self.min_y = 0
+        self.step_statistics = []
+
+    @property
+    def pixels(self):
+        """The image as a 2-dimensional array (rows first)"""
+        if self.__added_rows:
+            self.__pixels = numpy.array(self.__added_rows, dtype=numpy.uint8)
+            self.__added_rows.clear()
+        #
+        return self.__pixels
+
+    @property
+    def width(self):
+        """Number of columns"""
+        return self.pixels.shape[1]
+
+    @property
+    def height(self):
+        """Number of rows"""
+        return self.pixels.shape[0]
+
+    def add_line(self, line):
+        """Add a line to the image"""
+        if not line:
+            return
+        #
+        if not self.__added_rows and self.__pixels.size:
+            self.__added_rows.extend(self.__pixels.tolist())
+        #
+        self.__added_rows.append(
+            [int(pixel) for pixel in line.translate(INPUT2BIN)]
+        )
+
+    def shrink_to_bounding_box(self):
+        """Remove border rows and columns consisting
+        of infinity pixels only
+        """
+        differing = self.pixels != self.infinity_value
+        rows = numpy.flatnonzero(differing.any(axis=1))
+        if not rows.size:
+            self.min_x += self.width // 2
+            self.min_y += self.height // 2
+            self.__pixels = numpy.zeros((0, 0), dtype=numpy.uint8)
+            return
+        #
+        columns = numpy.flatnonzero(differing.any(axis=0))
+        first_row, last_row = int(rows[0]), int(rows[-1])
+        first_column, last_column = int(columns[0]), int(columns[-1])
+        self.__pixels = self.__pixels[
+            first_row:last_row + 1, first_column:last_column + 1
+        ]
+        self.min_x += first_column
+        self.min_y += first_row
+
+    def enhance(self):
+        """Enhance the image: grow it by one pixel on each side,
+        and shrink it to the new bounding box afterwards
+        """
+        start_time = time.perf_counter_ns()
+        padded = numpy.pad(
+            self.pixels,
+            2,
+            mode="constant",
+            constant_values=self.infinity_value,
+        )
+        height = padded.shape[0] - 2
+        width = padded.shape[1] - 2
+        enhancement_index = numpy.zeros((height, width), dtype=numpy.uint16)
+        for y_offset in range(3):
+            for x_offset in range(3):
+                enhancement_index <<= 1
+                enhancement_index |= padded[
+                    y_offset:y_offset + height, x_offset:x_offset + width
+                ]
+            #
+        #
+        self.__pixels = self.lookup_table[enhancement_index]
+        self.min_x -= 1
+        self.min_y -= 1
+        self.infinity_value = self.infinity_lookup[self.infinity_value]
+        self.shrink_to_bounding_box()
+        self.step_statistics.append(
+            dict(
+                nanoseconds=time.perf_counter_ns() - start_time,
+                width=self.width,
+                height=self.height,
+            )
+        )
+        logging.debug(
+            "Enhancement step #%s: %s ns, bounding box %s x %s at (%s, %s)",
+            len(self.step_statistics),
+            self.step_statistics[-1]["nanoseconds"],
+            self.width,
+            self.height,
+            self.min_x,
+            self.min_y,
+        )
+
+    def draw(self):
+        """Draw the current image"""
+        for row in self.pixels.tolist():
+            logging.info(
+                "".join(str(pixel) for pixel in row).translate(BIN2OUTPUT)
+            )
+        #
+
+    def lit_pixels(self):
+        """Return the number of lit pixels"""
+        if self.infinity_value:
+            raise ValueError("Infinitely many pixels are lit!")
+        #
+        return int(self.pixels.sum())
+
+
+class BitRowInputImage:
+
+    """Input image stored as a list of rows,
+    each row a Python int used as a bitmask:
+    the leftmost pixel is the most significant bit.
+    For enhancement, the padded rows are concatenated into one int,
+    so the 9-bit enhancement index bits of all pixels
+    are available at once in nine shifted copies of it.
+    Only the bounding box of the pixels differing from the infinity
+    pixel value is stored (its top left corner is at min_x, min_y),
+    so the image grows only where the enhancement requires it.
+    The cost of each enhancement step is recorded in step_statistics.
+    """
+
+    def __init__(self, enhancement_algorithm):
+        """Initialize the image and the lookup table"""
+        self.enhancement_algorithm = enhancement_algorithm
+        self.lookup_table = bytes(
+            (enhancement_algorithm >> index) & 1 for index in range(512)
+        )
+        self.infinity_value = 0
+        self.infinity_lookup = [
+            self.lookup_table[0],
+            self.lookup_table[0b111111111],
+        ]
+        self.rows = []
+        self.width = 0
+        self.min_x = 0
+        self.min_y = 0
+        self.step_statistics = []
+
+    @property
+    def height(self):
+        """Number of rows"""
+        return len(self.rows)
+
+    def add_line(self, line):
+        """Add a line to the image"""
+        if not line:
+            return
+        #
+        if self.rows and len(line) != self.width:
+            raise ValueError("All lines must have the same length!")
+        #
+        self.rows.append(int(line.translate(INPUT2BIN), 2))
+        self.width = len(line)
+
+    def evaluate_lookup(self, window, all_bits):
+        """Evaluate the lookup table bit-sliced on the window bits
+        (most significant window bit first),
+        return the integer containing the enhanced pixels
+        """
+        results = {}
+
+        def multiplex(level, low, high):
+            """Return the result for the lookup table slice [low:high],
+            selected by the window bits from level on
+            """
+            table_slice = self.lookup_table[low:high]
+            if not any(table_slice):
+                return 0
+            #
+            if all(table_slice):
+                return all_bits
+            #
+            try:
+                return results[level, table_slice]
+            except KeyError:
+                pass
+            #
+            middle = (low + high) // 2
+            if table_slice[:middle - low] == table_slice[middle - low:]:
+                result = multiplex(level + 1, low, middle)
+            else:
+                result_0 = multiplex(level + 1, low, middle)
+                result_1 = multiplex(level + 1, middle, high)
+                selector = window[level]
+                result = (selector & result_1) | (
+                    (selector ^ all_bits) & result_0
+                )
+            #
+            results[level, table_slice] = result
+            return result
+
+        return multiplex(0, 0, len(self.lookup_table))
+
+    def shrink_to_bounding_box(self):
+        """Remove border rows and columns consisting
+        of infinity pixels only
+        """
+        full_mask = (1 << self.width) - 1
+        if self.infinity_value:
+            differing = [row ^ full_mask for row in self.rows]
+        else:
+            differing = list(self.rows)
+        #
+        if not any(differing):
+            self.min_x += self.width // 2
+            self.min_y += self.height // 2
+            self.rows = []
+            self.width = 0
+            return
+        #
+        first_row = 0
+        while not differing[first_row]:
+            first_row += 1
+        #
+        last_row = len(differing) - 1
+        while not differing[last_row]:
+            last_row -= 1
+        #
+        differing = differing[first_row:last_row + 1]
+        combined = 0
+        for row in differing:
+            combined |= row
+        #
+        # Columns on the right side are the least significant bits
+        right_columns = (combined & -combined).bit_length() - 1
+        left_columns = self.width - combined.bit_length()
+        new_width = self.width - left_columns - right_columns
+        new_mask = (1 << new_width) - 1
+        self.rows = [
+            row >> right_columns & new_mask
+            for row in self.rows[first_row:last_row + 1]
+        ]
+        self.width = new_width
+        self.min_x += left_columns
+        self.min_y += first_row
+
+    def enhance(self):
+        """Enhance the image: grow it by one pixel on each side,
+        and shrink it to the new bounding box afterwards.
+        All rows (padded with infinity pixels) are concatenated
+        into one integer, so the enhancement works bit-sliced:
+        the nine window pixels of all image pixels at once
+        are provided by nine shifted copies of this integer,
+        and the lookup table is evaluated on them as a tree
+        of bitwise multiplexers.
+        """
+        start_time = time.perf_counter_ns()
+        old_width = self.width
+        padded_width = old_width + 4
+        padded_height = self.height + 4
+        total_bits = padded_width * padded_height
+        all_bits = (1 << total_bits) - 1
+        pad_char = str(self.infinity_value)
+        side_pad = pad_char * 2
+        pad_rows = [pad_char * padded_width] * 2
+        padded_image = int(
+            "".join(
+                pad_rows
+                + [
+                    f"{side_pad}{row:0{old_width}b}{side_pad}"
+                    for row in self.rows
+                ]
+                + pad_rows
+            ),
+            2,
+        )
+        # The first row is stored in the most significant bits,
+        # so the neighbor at (dx, dy) is aligned with each pixel
+        # by shifting left by dy * padded_width + dx
+        window = []
+        for y_offset in (-1, 0, 1):
+            for x_offset in (-1, 0, 1):
+                shift = y_offset * padded_width + x_offset
+                if shift >= 0:
+                    window.append(padded_image << shift & all_bits)
+                else:
+                    window.append(padded_image >> -shift)
+                #
+            #
+        #
+        enhanced = self.evaluate_lookup(window, all_bits)
+        enhanced_bits = f"{enhanced:0{total_bits}b}"
+        new_rows = [
+            int(
+                enhanced_bits[
+                    row_start + 1:row_start + padded_width - 1
+                ],
+                2,
+            )
+            for row_start in range(
+                padded_width, total_bits - padded_width, padded_width
+            )
+        ]
+        self.rows = new_rows
+        self.width = old_width + 2
+        self.min_x -= 1
+        self.min_y -= 1
+        self.infinity_value = self.infinity_lookup[self.infinity_value]
+        self.shrink_to_bounding_box()
+        self.step_statistics.append(
+            dict(
+                nanoseconds=time.perf_counter_ns() - start_time,
+                width=self.width,
+                height=self.height,
+            )
+        )
+        logging.debug(
+            "Enhancement step #%s: %s ns, bounding box %s x %s at (%s, %s)",
+            len(self.step_statistics),
+            self.step_statistics[-1]["nanoseconds"],
+            self.width,
+            self.height,
+            self.min_x,
+            self.min_y,
+        )
+
+    def draw(self):
+        """Draw the current image"""
+        for row in self.rows:
+            logging.info(
+                format(row, f"0{self.width}b").translate(BIN2OUTPUT)
+            )
+        #
+
+    def lit_pixels(self):
+        """Return the number of lit pixels"""
+        if self.infinity_value:
+            raise ValueError("Infinitely many pixels are lit!")
+        #
+        return sum(bin(row).count("1") for row in self.rows)
+
+
+ENGINES = {"bitrows": BitRowInputImage, "dict": InputImage}
+if numpy is not None:
+    ENGINES["numpy"] = NumpyInputImage
+    DEFAULT_ENGINE = "numpy"
+else:
+    DEFAULT_ENGINE = "bitrows"
+#
+
+
+@helpers.cached_parser(persistent=True)
 def parse_input(reader):
     """Return the image enhancement algorithm
-    and the input image as a tuple
+    and the input image lines as a tuple
     """
     enhancement_algorithm = None
-    image = None
+    image_lines = []
     for line in reader.lines():
         if enhancement_algorithm is None:
             if len(line) != 512:
@@ -121,9 +515,16 @@ def parse_input(reader):
             enhancement_algorithm = int(line.translate(INPUT2BIN)[::-1], 2)
             continue
         #
-        if image is None:
-            image = InputImage(enhancement_algorithm)
-        #
+        image_lines.append(line)
+    #
+    return enhancement_algorithm, tuple(image_lines)
+
+
+def load_image(reader, engine=DEFAULT_ENGINE):
+    """Return the input image, using the engine selected by name"""
+    enhancement_algorithm, image_lines = parse_input(reader)
+    image = ENGINES[engine](enhancement_algorithm)
+    for line in image_lines:
         image.add_line(line)
     #
     return image
@@ -132,7 +533,7 @@ def parse_input(reader):
 @helpers.timer
 def part1(reader):
     """Part 1"""
-    image = parse_input(reader)
+    image = load_image(reader)
     logging.info(image.enhancement_algorithm)
     image.draw()
     logging.info(SEPARATOR)
@@ -142,13 +543,13 @@ def part1(reader):
     image.enhance()
     image.draw()
     logging.info(SEPARATOR)
-    return sum(image.matrix.values())
+    return image.lit_pixels()
 
 
 @helpers.timer
 def part2(reader):
     """Part 2"""
-    image = parse_input(reader)
+    image = load_image(reader)
     logging.info(image.enhancement_algorithm)
     image.draw()
     logging.info(SEPARATOR)
@@ -158,7 +559,7 @@ def part2(reader):
     #
     image.draw()
     logging.info(SEPARATOR)
-    return sum(image.matrix.values())
+    return image.lit_pixels()
 
 
 if __name__ == "__main__":
@@ -4,10 +4,24 @@
 """
 Advent of code 2021, day 22
 blackstream-x’ solution
+
+Provides an additional coordinate compression engine
+if NumPy is available (pip install --user numpy)
 """
 
 
+import bisect
+import collections
+import functools
+import itertools
 import logging
+import time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+#
 
 import helpers
 
@@ -23,6 +37,8 @@ INITIALIZATION_AREA = dict(x=(-50, 50), y=(-50, 50), z=(-50, 50))
 
 SEPARATOR_LINE = "-" * 70
 
+DEFAULT_ENGINE = "inclusion-exclusion"
+
 
 class LimitsExceeded(Exception):
 
@@ -33,23 +49,43 @@ class LimitsExceeded(Exception):
 
 class Cuboid:
 
-    """Represents a cuboid"""
+    """Represents a cuboid.
+    Cuboids are not meant to be changed after creation:
+    the bounds tuple, the hash value and the volume
+    are calculated only once in the constructor.
+    """
+
+    __slots__ = ("x", "y", "z", "bounds", "__hash", "__volume")
 
     axes = "xyz"
 
-    def __init__(self, **kwargs):
+    # pylint: disable=invalid-name ; axis names as in the puzzle input
+    def __init__(self, x, y, z):
         """Initialize cuboid dimensions"""
-        self.dimensions = {}
-        for axis in self.axes:
-            start, end = kwargs[axis]
+        for start, end in (x, y, z):
             if start > end:
                 raise ValueError(
-                    f"Invalid coordinates {kwargs}; all start coordinates must"
-                    " be less or equal to their respective end coordinate!"
+                    f"Invalid coordinates x={x}, y={y}, z={z};"
+                    " all start coordinates must be less or equal"
+                    " to their respective end coordinate!"
                 )
             #
-            self.dimensions[axis] = (start, end)
         #
+        self.x = x
+        self.y = y
+        self.z = z
+        self.bounds = x + y + z
+        self.__hash = hash(self.bounds)
+        self.__volume = bounds_volume(self.bounds)
+
+    # pylint: enable
+
+    @classmethod
+    def from_bounds(cls, bounds):
+        """Factory method: return a cuboid instance
+        from a bounds tuple (x_start, x_end, y_start, y_end, z_start, z_end)
+        """
+        return cls(bounds[0:2], bounds[2:4], bounds[4:6])
 
     @classmethod
     def from_string(cls, coordinates, limits=None):
@@ -95,23 +131,17 @@ class Cuboid:
 
     def __getitem__(self, name):
         """Return the dimensions"""
-        return self.dimensions[name]
-
-    def __getattr__(self, name):
-        """Return the dimensions"""
-        return self[name]
+        if name not in self.axes:
+            raise KeyError(name)
+        #
+        return getattr(self, name)
 
     def all_cubes(self):
         """Return an iterator over all cubes
         (ie. (x, y, z) positions tuples) in the cuboid"""
-        dimension_ranges = {}
-        for axis in self.axes:
-            minimum, maximum = self.dimensions[axis]
-            dimension_ranges[axis] = range(minimum, maximum + 1)
-        #
-        for x_pos in dimension_ranges["x"]:
-            for y_pos in dimension_ranges["y"]:
-                for z_pos in dimension_ranges["z"]:
+        for x_pos in range(self.x[0], self.x[1] + 1):
+            for y_pos in range(self.y[0], self.y[1] + 1):
+                for z_pos in range(self.z[0], self.z[1] + 1):
                     yield (x_pos, y_pos, z_pos)
                 #
             #
@@ -119,36 +149,32 @@ class Cuboid:
 
     def volume(self):
         """Return the volume of the cuboid"""
-        return self.width * self.height * self.depth
+        return self.__volume
 
     def intersection(self, other):
         """Return the cuboid intersecting between self and other,
         or None if there is no intersection
         """
-        intersect_data = {}
-        for axis, my_coord in self.dimensions.items():
-            your_coord = other[axis]
-            if any(
-                (
-                    my_coord[0] > your_coord[1],
-                    my_coord[1] < your_coord[0],
-                )
-            ):
-                # No intersection
-                return None
-            #
-            intersect_data[axis] = (
-                max(my_coord[0], your_coord[0]),
-                min(my_coord[1], your_coord[1]),
+        intersect_bounds_tuple = intersect_bounds(self.bounds, other.bounds)
+        if intersect_bounds_tuple is None:
+            # No intersection
+            return None
+        #
+        if intersect_bounds_tuple == self.bounds:
+            intersect_cuboid = self
+        elif intersect_bounds_tuple == other.bounds:
+            intersect_cuboid = other
+        else:
+            intersect_cuboid = Cuboid.from_bounds(intersect_bounds_tuple)
+        #
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "[intersect] Intersection of %s and %s => %s",
+                self,
+                other,
+                intersect_cuboid,
             )
         #
-        intersect_cuboid = Cuboid(**intersect_data)
-        logging.debug(
-            "[intersect] Intersection of %s and %s => %s",
-            self,
-            other,
-            intersect_cuboid,
-        )
         return intersect_cuboid
 
     def split(self, **kwargs):
@@ -161,75 +187,47 @@ class Cuboid:
         one with (x=3,3, y=(6,7), z=(0,1))
         and one with (x=4,5, y=(6,7), z=(0,1))
         """
-        logging.debug("[split] Splitting %s at %s ...", self, kwargs)
-        split_cuboids = set([self])
-        for axis in self.axes:
-            try:
-                split_at = kwargs[axis]
-            except KeyError:
-                continue
-            #
-            for coord in split_at:
-                new_cuboids = set()
-                for cuboid in split_cuboids:
-                    work_dims = dict(cuboid.dimensions)
-                    minor_1 = cuboid[axis][0]
-                    major_2 = cuboid[axis][1]
-                    if minor_1 + 1 <= coord <= major_2:
-                        logging.debug(
-                            "[split] * Splitting %s at %s=%s into:",
-                            cuboid,
-                            axis,
-                            coord,
-                        )
-                        major_1 = coord
-                        minor_2 = major_1 - 1
-                        work_dims.update({axis: (minor_1, minor_2)})
-                        result1 = Cuboid(**work_dims)
-                        work_dims.update({axis: (major_1, major_2)})
-                        result2 = Cuboid(**work_dims)
-                        logging.debug("[split]    - %s", result1)
-                        logging.debug("[split]    - %s", result2)
-                        new_cuboids.update((result1, result2))
+        split_bounds = [self.bounds]
+        for start_index, axis in zip((0, 2, 4), self.axes):
+            for coord in kwargs.get(axis, ()):
+                new_bounds = []
+                for bounds in split_bounds:
+                    start, end = bounds[start_index:start_index + 2]
+                    if start < coord <= end:
+                        head = bounds[:start_index]
+                        tail = bounds[start_index + 2:]
+                        new_bounds.append(head + (start, coord - 1) + tail)
+                        new_bounds.append(head + (coord, end) + tail)
                     else:
-                        new_cuboids.add(cuboid)
+                        new_bounds.append(bounds)
                     #
                 #
-                split_cuboids = new_cuboids
-                logging.debug(
-                    "[split] * after %s=%s split: %s cuboids",
-                    axis,
-                    coord,
-                    len(split_cuboids),
-                )
+                split_bounds = new_bounds
             #
         #
-        logging.debug(
-            "[split] Split resulted in %s cuboids", len(split_cuboids)
-        )
-        return list(split_cuboids)
+        if len(split_bounds) == 1:
+            return [self]
+        #
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "[split] Splitting %s at %s resulted in %s cuboids",
+                self,
+                kwargs,
+                len(split_bounds),
+            )
+        #
+        return [Cuboid.from_bounds(bounds) for bounds in split_bounds]
 
     def __hash__(self):
         """hash value"""
-        return hash(str(self))
+        return self.__hash
 
     def __eq__(self, other):
         """Equality test"""
-        for axis in self.axes:
-            if self[axis] != other[axis]:
-                return False
-            #
-        #
-        return True
-
-    def __ne__(self, other):
-        """Inequality test"""
-        for axis in self.axes:
-            if self[axis] != other[axis]:
-                return True
-            #
+        if not isinstance(other, Cuboid):
+            return NotImplemented
         #
-        return False
+        return self.bounds == other.bounds
 
     def __str__(self):
         """String representation"""
@@ -241,42 +239,527 @@ class Cuboid:
         return f"{self.__class__.__name__}({','.join(dims)})"
 
     def __sub__(self, other):
-        """Subtract other from self"""
-        intersected = self.intersection(other)
-        if not intersected:
+        """Subtract other from self, return a list of at most 6
+        non-overlapping cuboids: the slabs of self left and right
+        of the intersection (along x), then below and above it
+        (along y, limited to the intersection’s x range),
+        and finally in front and behind it (along z,
+        limited to the intersection’s x and y ranges)
+        """
+        intersected = intersect_bounds(self.bounds, other.bounds)
+        if intersected is None:
             return [self]
         #
-        split_coordinates = {}
-        for axis in self.axes:
-            start, end = intersected[axis]
-            split_coordinates[axis] = (start, end + 1)
+        (x_start, x_end, y_start, y_end, z_start, z_end) = self.bounds
+        (
+            inner_x_start,
+            inner_x_end,
+            inner_y_start,
+            inner_y_end,
+            inner_z_start,
+            inner_z_end,
+        ) = intersected
+        remaining_bounds = []
+        if x_start < inner_x_start:
+            remaining_bounds.append(
+                (x_start, inner_x_start - 1) + self.bounds[2:]
+            )
+        #
+        if inner_x_end < x_end:
+            remaining_bounds.append((inner_x_end + 1, x_end) + self.bounds[2:])
+        #
+        if y_start < inner_y_start:
+            remaining_bounds.append(
+                intersected[:2]
+                + (y_start, inner_y_start - 1)
+                + self.bounds[4:]
+            )
+        #
+        if inner_y_end < y_end:
+            remaining_bounds.append(
+                intersected[:2] + (inner_y_end + 1, y_end) + self.bounds[4:]
+            )
+        #
+        if z_start < inner_z_start:
+            remaining_bounds.append(
+                intersected[:4] + (z_start, inner_z_start - 1)
+            )
+        #
+        if inner_z_end < z_end:
+            remaining_bounds.append(intersected[:4] + (inner_z_end + 1, z_end))
         #
         non_overlapping = [
-            cuboid
-            for cuboid in self.split(**split_coordinates)
-            if cuboid != intersected
+            Cuboid.from_bounds(bounds) for bounds in remaining_bounds
         ]
-        logging.debug(
-            "[sub] Subtracting %s from %s resulted in %s cuboids:",
-            other,
-            self,
-            len(non_overlapping),
-        )
-        for cuboid in non_overlapping:
-            logging.debug("[sub] %s", cuboid)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                "[sub] Subtracting %s from %s resulted in %s cuboids:",
+                other,
+                self,
+                len(non_overlapping),
+            )
+            for cuboid in non_overlapping:
+                logging.debug("[sub] %s", cuboid)
+            #
         #
         return non_overlapping
 
 
-def operate_reactor(line_generator, expected_result=None, limits=None):
-    """Operate the reactor.
+def intersect_bounds(first, second):
+    """Return the bounds of the intersection of the cuboids
+    given by the bounds tuples first and second,
+    or None if they do not intersect
+    """
+    (first_x0, first_x1, first_y0, first_y1, first_z0, first_z1) = first
+    (
+        second_x0,
+        second_x1,
+        second_y0,
+        second_y1,
+        second_z0,
+        second_z1,
+    ) = second
+    x_start = max(first_x0, second_x0)
+    x_end = min(first_x1, second_x1)
+    if x_start > x_end:
+        return None
+    #
+    y_start = max(first_y0, second_y0)
+    y_end = min(first_y1, second_y1)
+    if y_start > y_end:
+        return None
+    #
+    z_start = max(first_z0, second_z0)
+    z_end = min(first_z1, second_z1)
+    if z_start > z_end:
+        return None
+    #
+    return (x_start, x_end, y_start, y_end, z_start, z_end)
+
+
+def bounds_volume(bounds):
+    """Return the volume of the cuboid given by the bounds tuple"""
+    (x_start, x_end, y_start, y_end, z_start, z_end) = bounds
+    return (
+        (x_end + 1 - x_start) * (y_end + 1 - y_start) * (z_end + 1 - z_start)
+    )
+
+
+class CuboidIndex:
+
+    """Spatial index of cuboids: a hierarchical grid.
+    Each cuboid is stored on the level given by the bit length
+    of its largest extent, so it is smaller than the level’s cell size
+    on all axes, in the cell containing its start corner.
+    Only cuboids in the cells from (start - cell size) to end
+    of another cuboid on each axis of each level can intersect it,
+    so only these are tested for an intersection. If there are
+    fewer occupied cells on a level than cells in that range,
+    the occupied cells are checked instead.
+    """
+
+    def __init__(self):
+        """Initialize the index"""
+        self.__levels = {}
+        self.__size = 0
+
+    def __len__(self):
+        """Number of cuboids in the index"""
+        return self.__size
+
+    def __iter__(self):
+        """Iterate over all cuboids in the index"""
+        for cells in self.__levels.values():
+            for cuboids in cells.values():
+                yield from cuboids
+            #
+        #
+
+    @staticmethod
+    def location(cuboid):
+        """Return the level and the cell of the cuboid"""
+        level = max(cuboid.width, cuboid.height, cuboid.depth).bit_length()
+        return (
+            level,
+            (cuboid.x[0] >> level, cuboid.y[0] >> level, cuboid.z[0] >> level),
+        )
+
+    def add(self, cuboid):
+        """Add a cuboid to the index"""
+        level, cell = self.location(cuboid)
+        self.__levels.setdefault(level, {}).setdefault(cell, []).append(
+            cuboid
+        )
+        self.__size += 1
+
+    def candidate_cells(self, other):
+        """Yield (cells, cell) tuples for all occupied cells
+        that may contain cuboids intersecting the other cuboid
+        """
+        for level, cells in self.__levels.items():
+            offset = (1 << level) - 2
+            ranges = [
+                range((start - offset) >> level, (end >> level) + 1)
+                for start, end in (other.x, other.y, other.z)
+            ]
+            x_range, y_range, z_range = ranges
+            if len(x_range) * len(y_range) * len(z_range) <= len(cells):
+                for cell in itertools.product(*ranges):
+                    if cell in cells:
+                        yield cells, cell
+                    #
+                #
+                continue
+            #
+            for cell in list(cells):
+                if (
+                    cell[0] in x_range
+                    and cell[1] in y_range
+                    and cell[2] in z_range
+                ):
+                    yield cells, cell
+                #
+            #
+        #
+
+    def pop_intersecting(self, other):
+        """Remove all cuboids intersecting the other cuboid
+        from the index and return them as a list
+        """
+        intersecting = []
+        for cells, cell in list(self.candidate_cells(other)):
+            kept = []
+            found = False
+            for cuboid in cells[cell]:
+                if cuboid.intersection(other) is None:
+                    kept.append(cuboid)
+                else:
+                    intersecting.append(cuboid)
+                    found = True
+                #
+            #
+            if not found:
+                continue
+            #
+            if kept:
+                cells[cell] = kept
+            else:
+                del cells[cell]
+            #
+        #
+        self.__size -= len(intersecting)
+        return intersecting
+
+    def remove(self, cuboid):
+        """Remove the cuboid from the index.
+        Raise a ValueError if it is not in the index.
+        """
+        level, cell = self.location(cuboid)
+        try:
+            cells = self.__levels[level]
+            cuboids = cells[cell]
+        except KeyError as error:
+            raise ValueError(f"{cuboid} is not in the index") from error
+        #
+        cuboids.remove(cuboid)
+        if not cuboids:
+            del cells[cell]
+        #
+        self.__size -= 1
+
+
+class SplittingReactor:
+
+    """Reactor containing non-overlapping cuboids.
+    Before adding a cuboid, it is subtracted from all
+    existing cuboids in the reactor intersecting it
+    (as found using a CuboidIndex),
+    thus guaranteeing that no cuboids overlap.
+    """
+
+    def __init__(self):
+        """Initialize the reactor"""
+        self.cuboids = CuboidIndex()
+
+    def __len__(self):
+        """Number of cuboids in the reactor"""
+        return len(self.cuboids)
+
+    def switch(self, turn_on, new_cuboid):
+        """Switch all cubes in new_cuboid on or off"""
+        for current_cuboid in self.cuboids.pop_intersecting(new_cuboid):
+            for remaining_cuboid in current_cuboid - new_cuboid:
+                self.cuboids.add(remaining_cuboid)
+            #
+        #
+        if turn_on:
+            self.cuboids.add(new_cuboid)
+        #
+
+    @property
+    def volume(self):
+        """Total volume of all cubes switched on"""
+        return sum(cuboid.volume() for cuboid in self.cuboids)
+
+
+class IncrementalReactor(SplittingReactor):
+
+    """Splitting reactor for monitoring a stream of reboot steps:
+    each switch operation updates the total volume
+    with the volumes of the removed and added cuboids only,
+    and returns it.
+    The removed and added cuboids of each switch operation
+    are recorded in a journal (limited to the last undo_limit
+    operations if undo_limit is not None),
+    so the last operations can be undone,
+    and the reactor can be restored to a snapshot.
+    """
+
+    def __init__(self, undo_limit=None):
+        """Initialize the reactor"""
+        super().__init__()
+        self.__volume = 0
+        self.applied_operations = 0
+        self.journal = collections.deque(maxlen=undo_limit)
+
+    @property
+    def volume(self):
+        """Total volume of all cubes switched on"""
+        return self.__volume
+
+    def switch(self, turn_on, new_cuboid):
+        """Switch all cubes in new_cuboid on or off,
+        return the new total volume
+        """
+        removed_cuboids = self.cuboids.pop_intersecting(new_cuboid)
+        added_cuboids = [
+            remaining_cuboid
+            for current_cuboid in removed_cuboids
+            for remaining_cuboid in current_cuboid - new_cuboid
+        ]
+        if turn_on:
+            added_cuboids.append(new_cuboid)
+        #
+        for cuboid in added_cuboids:
+            self.cuboids.add(cuboid)
+        #
+        self.__volume += sum(cuboid.volume() for cuboid in added_cuboids)
+        self.__volume -= sum(cuboid.volume() for cuboid in removed_cuboids)
+        self.journal.append((removed_cuboids, added_cuboids))
+        self.applied_operations += 1
+        return self.__volume
+
+    def undo(self, operations=1):
+        """Undo the last operations, return the new total volume.
+        Raise a ValueError if the journal does not reach back that far.
+        """
+        if operations > len(self.journal):
+            raise ValueError(
+                f"Cannot undo {operations} operations,"
+                f" only the last {len(self.journal)} were recorded!"
+            )
+        #
+        for _ in range(operations):
+            removed_cuboids, added_cuboids = self.journal.pop()
+            for cuboid in added_cuboids:
+                self.cuboids.remove(cuboid)
+            #
+            for cuboid in removed_cuboids:
+                self.cuboids.add(cuboid)
+            #
+            self.__volume -= sum(cuboid.volume() for cuboid in added_cuboids)
+            self.__volume += sum(
+                cuboid.volume() for cuboid in removed_cuboids
+            )
+            self.applied_operations -= 1
+        #
+        return self.__volume
+
+    def snapshot(self):
+        """Return a snapshot identifier for restore()"""
+        return self.applied_operations
+
+    def restore(self, snapshot):
+        """Restore the state at the time the snapshot was taken
+        by undoing all operations since then,
+        return the total volume
+        """
+        if snapshot > self.applied_operations:
+            raise ValueError("Cannot restore a snapshot from the future!")
+        #
+        return self.undo(self.applied_operations - snapshot)
+
+
+class InclusionExclusionReactor:
+
+    """Reactor containing possibly overlapping cuboids
+    (as plain bounds tuples) with signed multiplicities,
+    following the inclusion-exclusion principle:
+    for each cuboid already in the reactor, its intersection
+    with the new cuboid is added with the negated multiplicity,
+    so the cubes of the new cuboid are not counted twice
+    (or, when switching off, not at all).
+    When switching on, the new cuboid itself is added
+    with a multiplicity of 1.
+    The total volume is updated with each switch operation.
+    """
+
+    def __init__(self):
+        """Initialize the reactor"""
+        self.cuboids = collections.Counter()
+        self.volume = 0
+
+    def __len__(self):
+        """Number of cuboids in the reactor"""
+        return len(self.cuboids)
+
+    def switch(self, turn_on, new_cuboid):
+        """Switch all cubes in new_cuboid on or off"""
+        new_bounds = new_cuboid.bounds
+        changes = collections.Counter()
+        for bounds, multiplicity in self.cuboids.items():
+            intersection = intersect_bounds(new_bounds, bounds)
+            if intersection is not None:
+                changes[intersection] -= multiplicity
+            #
+        #
+        if turn_on:
+            changes[new_bounds] += 1
+        #
+        for bounds, multiplicity in changes.items():
+            if not multiplicity:
+                continue
+            #
+            self.volume += multiplicity * bounds_volume(bounds)
+            new_multiplicity = self.cuboids[bounds] + multiplicity
+            if new_multiplicity:
+                self.cuboids[bounds] = new_multiplicity
+            else:
+                del self.cuboids[bounds]
+            #
+        #
+
+
+class CompressedGridReactor:
+
+    """Reactor using coordinate compression:
+    the distinct start and end + 1 coordinates of the cuboids
+    divide each axis into cells of different sizes,
+    and each switch operation sets a block of whole cells.
+    As all coordinates must be known in advance,
+    switch operations are only recorded,
+    and the volume is calculated from them on demand.
+    A 3-dimensional boolean NumPy array over all cells
+    would need about 600 MB for the puzzle input,
+    and summing up the weighted areas of its 840 (y, z) planes
+    alone takes more than a second.
+    So the volume is summed up slice by slice along the x axis
+    instead, compressing the y and z coordinates of only
+    the switch operations affecting each slice:
+    these operations are replayed in order as slice assignments
+    to a small 2-dimensional (y, z) array, and its area is the sum
+    of the switched-on cells weighted by their sizes.
+    Slices affected by the same switch operations share the same area.
+    This takes about 0.09 s for the puzzle input,
+    about as long as the splitting engines
+    and less than half the time of the inclusion-exclusion engine.
+    """
+
+    def __init__(self):
+        """Initialize the reactor"""
+        self.switch_operations = []
+
+    def __len__(self):
+        """Number of recorded switch operations"""
+        return len(self.switch_operations)
+
+    def switch(self, turn_on, new_cuboid):
+        """Record switching all cubes in new_cuboid on or off"""
+        self.switch_operations.append((turn_on,) + new_cuboid.bounds)
+
+    @staticmethod
+    def plane_area(operations):
+        """Return the area switched on by the operations
+        (an array of rows (turn_on, x_start, x_end, y_start, y_end,
+        z_start, z_end) in the order of execution)
+        in the (y, z) plane
+        """
+        cell_ranges = []
+        cell_sizes = []
+        for axis_column in (3, 5):
+            starts = operations[:, axis_column]
+            ends = operations[:, axis_column + 1] + 1
+            edges = numpy.unique(numpy.concatenate((starts, ends)))
+            cell_ranges.append(
+                (
+                    numpy.searchsorted(edges, starts).tolist(),
+                    numpy.searchsorted(edges, ends).tolist(),
+                )
+            )
+            cell_sizes.append(numpy.diff(edges))
+        #
+        (y_starts, y_ends), (z_starts, z_ends) = cell_ranges
+        y_sizes, z_sizes = cell_sizes
+        plane = numpy.zeros((y_sizes.size, z_sizes.size), dtype=bool)
+        for number, turn_on in enumerate(operations[:, 0].tolist()):
+            plane[
+                y_starts[number]:y_ends[number],
+                z_starts[number]:z_ends[number],
+            ] = turn_on
+        #
+        return int(y_sizes @ plane @ z_sizes)
+
+    @property
+    def volume(self):
+        """Total volume of all cubes switched on"""
+        if not self.switch_operations:
+            return 0
+        #
+        operations = numpy.array(self.switch_operations, dtype=numpy.int64)
+        x_starts = operations[:, 1]
+        x_ends = operations[:, 2] + 1
+        x_edges = numpy.unique(numpy.concatenate((x_starts, x_ends)))
+        areas = {}
+        total_volume = 0
+        for x_start, x_end in zip(x_edges[:-1].tolist(), x_edges[1:].tolist()):
+            affecting = numpy.flatnonzero(
+                (x_starts <= x_start) & (x_ends > x_start)
+            )
+            key = affecting.tobytes()
+            try:
+                area = areas[key]
+            except KeyError:
+                area = areas[key] = self.plane_area(operations[affecting])
+            #
+            total_volume += (x_end - x_start) * area
+        #
+        return total_volume
+
+
+ENGINES = {
+    "incremental": IncrementalReactor,
+    "inclusion-exclusion": InclusionExclusionReactor,
+    "split": SplittingReactor,
+}
+if numpy is not None:
+    ENGINES["compressed"] = CompressedGridReactor
+#
+
+
+def operate_reactor(
+    line_generator,
+    expected_result=None,
+    limits=None,
+    engine=DEFAULT_ENGINE,
+    stats=None,
+):
+    """Operate the reactor, using the engine selected by name.
     Adding a cuboid turns all cubes in the cuboid on,
     subtracting it turns all of them off.
-    Before adding a cuboid, it is subtracted from all
-    existing cuboids in the reactor, thus guaranteeing
-    that no cuboids overlap.
+    If a stats dict is provided, the number of cuboids
+    in the reactor is stored in it (key "cuboids").
     """
-    reactor = set()
+    reactor = ENGINES[engine]()
     processed_lines = 0
     skipped_lines = 0
     try:
@@ -291,18 +774,11 @@ def operate_reactor(line_generator, expected_result=None, limits=None):
                 logging.error(error)
                 continue
             #
-            new_reactor = set()
-            while reactor:
-                current_cuboid = reactor.pop()
-                new_reactor.update(current_cuboid - new_cuboid)
-            #
-            if instruction == "on":
-                new_reactor.add(new_cuboid)
-                logging.info("Switched on %s", new_cuboid)
-            else:
-                logging.info("Switched off %s", new_cuboid)
-            #
-            reactor = new_reactor
+            turn_on = instruction == "on"
+            reactor.switch(turn_on, new_cuboid)
+            logging.info(
+                "Switched %s %s", "on" if turn_on else "off", new_cuboid
+            )
             processed_lines += 1
         #
     except KeyboardInterrupt:
@@ -310,11 +786,15 @@ def operate_reactor(line_generator, expected_result=None, limits=None):
     else:
         processed_lines = f"all {processed_lines}"
     #
-    total_volume = sum(cuboid.volume() for cuboid in reactor)
+    total_volume = reactor.volume
+    if stats is not None:
+        stats["cuboids"] = len(reactor)
+    #
     logging.info(
-        "After processing %s lines, the reactor contains %s"
-        " non-overlapping cuboids with a total volume of %s cubes.",
+        "After processing %s lines, the %s reactor contains %s"
+        " cuboids with a total volume of %s cubes.",
         processed_lines,
+        engine,
         len(reactor),
         total_volume,
     )
@@ -333,6 +813,57 @@ def operate_reactor(line_generator, expected_result=None, limits=None):
     return total_volume
 
 
+def monitor_reactor(line_generator, limits=None, reactor=None):
+    """Operate the reactor (a new IncrementalReactor if None)
+    one reboot step at a time,
+    yield each processed line together with the total volume after it.
+    Lines exceeding the limits are skipped,
+    malformed lines are logged and skipped as well.
+    """
+    if reactor is None:
+        reactor = IncrementalReactor()
+    #
+    for line in line_generator():
+        try:
+            instruction, coordinates = line.split(None, 1)
+            new_cuboid = Cuboid.from_string(coordinates, limits=limits)
+        except LimitsExceeded:
+            continue
+        except ValueError as error:
+            logging.error(error)
+            continue
+        #
+        yield line, reactor.switch(instruction == "on", new_cuboid)
+    #
+
+
+def compare_engines(
+    reader, engines=tuple(ENGINES), line_counts=(25, 50, 100, 200, None)
+):
+    """Benchmark the reactor engines on the first lines
+    of the input (all lines if the count is None),
+    yield a dict with the results for each line count and engine
+    """
+    all_lines = list(reader.lines())
+    for line_count in line_counts:
+        lines = all_lines[:line_count]
+        for engine in engines:
+            stats = {}
+            start = time.perf_counter_ns()
+            answer = operate_reactor(
+                functools.partial(iter, lines), engine=engine, stats=stats
+            )
+            yield dict(
+                case=f"{len(lines)} lines",
+                engine=engine,
+                answer=answer,
+                nanoseconds=time.perf_counter_ns() - start,
+                **stats,
+            )
+        #
+    #
+
+
 @helpers.timer
 def part0(*unused_reader):
     """Part 0"""
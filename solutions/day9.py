@@ -30,12 +30,9 @@ class HeightMap:
 
     """Height map of the submarine floor"""
 
-    def __init__(self, lines_sequence):
-        """Store lines"""
-        self.lines = tuple(
-            tuple(int(character) for character in line)
-            for line in lines_sequence
-        )
+    def __init__(self, heights):
+        """Store the heights (a tuple of rows, each a tuple of ints)"""
+        self.lines = heights
         self.max_y = len(self.lines) - 1
         self.basins = {}
         self.basins_lookup = {}
@@ -143,10 +140,19 @@ class HeightMap:
         #
 
 
+@helpers.cached_parser
+def parse_heights(reader):
+    """Return the heights as a tuple of rows, each a tuple of ints"""
+    return tuple(
+        tuple(int(character) for character in line)
+        for line in reader.lines()
+    )
+
+
 @helpers.timer
 def part1(reader):
     """Part 1"""
-    height_map = HeightMap(reader.lines())
+    height_map = HeightMap(parse_heights(reader))
     result = sum(height + 1 for height in height_map.find_low_points())
     return result
 
@@ -154,7 +160,8 @@ def part1(reader):
 @helpers.timer
 def part2(reader):
     """Part 2"""
-    height_map = HeightMap(reader.lines())
+    # The immutable heights are shared, the basins are new
+    height_map = HeightMap(parse_heights(reader))
     height_map.find_basins()
     basins_by_size = sorted(
         [len(positions) for positions in height_map.basins.values()]
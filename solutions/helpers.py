@@ -8,8 +8,21 @@ for blackstream-x’ solutions
 
 import argparse
 import collections
+import copy
+import cProfile
+import functools
+import glob
+import hashlib
+import importlib
 import logging
+import mmap
+import os
+import pickle
+import pstats
+import re
 import sys
+import tempfile
+import threading
 import time
 
 
@@ -20,6 +33,34 @@ import time
 
 Position = collections.namedtuple("Position", ("x", "y"))
 
+SOLUTIONS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+INPUTS_DIRECTORY = "inputs"
+
+# Persistent parse cache: subdirectory of the input files’ directory,
+# disabled by setting the environment variable AOC_PARSE_CACHE to "off"
+PARSE_CACHE_DIRECTORY = ".cache"
+PERSISTENT_PARSE_CACHE = os.environ.get("AOC_PARSE_CACHE") != "off"
+
+# Profiling of functions decorated with timer:
+# mode is None (disabled), PROFILE_CPROFILE or PROFILE_SAMPLE.
+# parse_arguments() sets these from the command line options,
+# falling back to the AOC_PROFILE, AOC_PROFILE_DIR and AOC_PROFILE_TOP
+# environment variables and then to the defaults below.
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLE = "sample"
+PROFILE_MODES = (PROFILE_CPROFILE, PROFILE_SAMPLE)
+PROFILING = dict(
+    mode=None,
+    directory="profiles",
+    top=20,
+    interval=0.001,
+)
+
+WHITESPACE_BYTES = frozenset(b" \t\n\r\x0b\x0c")
+
+PRX_SOLUTION_MODULE = re.compile(r"\Aday(\d+)\.py\Z")
+PRX_PART_FUNCTION = re.compile(r"\Apart(\d+)\Z")
+
 
 class Reader:
 
@@ -29,16 +70,23 @@ class Reader:
 
     def __init__(self, file_name=None, text=None):
         """Read the file and keep its contents"""
+        self.parse_cache = {}
+        self.file_name = None
         if text:
             self.file_contents = text
         elif file_name:
             with open(file_name, mode="rt", encoding="utf-8") as input_file:
                 self.file_contents = input_file.read()
             #
+            self.file_name = file_name
         else:
             self.file_contents = sys.stdin.read()
         #
 
+    def content_hash(self):
+        """Return a hash of the contents"""
+        return hashlib.sha256(self.file_contents.encode("utf-8")).hexdigest()
+
     def lines(self, rstrip=True, skip_empty=True):
         """Yield lines from the contents"""
         for line in self.file_contents.splitlines(keepends=True):
@@ -57,6 +105,214 @@ class Reader:
         #
 
 
+class MappedReader(Reader):
+
+    """Memory-map a file and provide generator methods
+    yielding lines or line parts without reading the whole file
+    into memory.
+    If decode is False, lines are yielded as memoryview slices
+    of the mapped file (ie. without decoding or copying them),
+    else each line is decoded on demand.
+    """
+
+    # pylint: disable=super-init-not-called ; file_contents not used here
+    def __init__(self, file_name, decode=True):
+        """Map the file"""
+        self.parse_cache = {}
+        self.file_name = file_name
+        self.decode = decode
+        with open(file_name, mode="rb") as input_file:
+            try:
+                self.mapped_contents = mmap.mmap(
+                    input_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                # Empty files cannot be mapped
+                self.mapped_contents = b""
+            #
+        #
+
+    # pylint: enable
+
+    def content_hash(self):
+        """Return a hash of the mapped file contents"""
+        return hashlib.sha256(self.mapped_contents).hexdigest()
+
+    def raw_lines(self, rstrip=True, skip_empty=True):
+        """Yield lines from the mapped file as memoryview slices"""
+        contents = self.mapped_contents
+        view = memoryview(contents)
+        total_length = len(contents)
+        start = 0
+        while start < total_length:
+            end = contents.find(b"\n", start)
+            if end < 0:
+                end = total_length
+            else:
+                end += 1
+            #
+            next_start = end
+            if rstrip:
+                while end > start and contents[end - 1] in WHITESPACE_BYTES:
+                    end -= 1
+                #
+            #
+            if end > start or not skip_empty:
+                yield view[start:end]
+            #
+            start = next_start
+        #
+
+    def lines(self, rstrip=True, skip_empty=True, decode=None):
+        """Yield lines from the mapped file,
+        decoded if decode (default: as given on initialization)
+        """
+        if decode is None:
+            decode = self.decode
+        #
+        for line in self.raw_lines(rstrip=rstrip, skip_empty=skip_empty):
+            if decode:
+                yield str(line, "utf-8")
+            else:
+                yield line
+            #
+        #
+
+    def splitted_lines(self, by_=None, rstrip=True, skip_empty=True):
+        """Yield lines splitted
+        (as lists of bytes if decoding is disabled)
+        """
+        if not self.decode and isinstance(by_, str):
+            by_ = by_.encode("utf-8")
+        #
+        for line in self.lines(rstrip=rstrip, skip_empty=skip_empty):
+            if not self.decode:
+                line = line.tobytes()
+            #
+            yield line.split(by_)
+        #
+
+
+class StreamReader(Reader):
+
+    """Read lines incrementally from an open text stream
+    (by default: stdin), yielding each line as soon as it arrives
+    without buffering the whole input.
+    The lines can be consumed only once.
+    """
+
+    # pylint: disable=super-init-not-called ; file_contents not used here
+    def __init__(self, stream=None):
+        """Keep the stream"""
+        self.parse_cache = {}
+        # Streams are never cached persistently
+        self.file_name = None
+        self.stream = stream or sys.stdin
+        self.consumed = False
+
+    # pylint: enable
+
+    def lines(self, rstrip=True, skip_empty=True):
+        """Yield lines from the stream"""
+        if self.consumed:
+            raise ValueError("The stream has already been consumed!")
+        #
+        self.consumed = True
+        for line in iter(self.stream.readline, ""):
+            if rstrip:
+                line = line.rstrip()
+            #
+            if line or not skip_empty:
+                yield line
+            #
+        #
+
+
+class StackSampler(threading.Thread):
+
+    """Sampling profiler: periodically record the call stack
+    of the observed thread as collapsed stack strings
+    (frames separated by semicolons, outermost first)
+    """
+
+    def __init__(self, observed_thread_id, interval=0.001):
+        """Initialize the sampler"""
+        super().__init__(daemon=True)
+        self.observed_thread_id = observed_thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """Take samples until stopped"""
+        while not self.stop_event.wait(self.interval):
+            # pylint: disable=protected-access ; no public API for this
+            frame = sys._current_frames().get(self.observed_thread_id)
+            # pylint: enable
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                )
+                frame = frame.f_back
+            #
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+            #
+        #
+
+    def stop(self):
+        """Stop sampling"""
+        self.stop_event.set()
+        self.join()
+
+    def write_collapsed(self, file_name):
+        """Write the samples in flamegraph.pl compatible
+        collapsed stack format
+        """
+        with open(file_name, mode="wt", encoding="utf-8") as collapsed:
+            for stack, count in sorted(self.stacks.items()):
+                collapsed.write(f"{stack} {count}\n")
+            #
+        #
+
+    def print_top(self, top=20, stream=sys.stderr):
+        """Print the functions with the most samples on top of the stack"""
+        own_samples = collections.Counter()
+        for stack, count in self.stacks.items():
+            own_samples[stack.rsplit(";", 1)[-1]] += count
+        #
+        total = sum(own_samples.values()) or 1
+        print(f"{'samples':>8} {'percent':>8}  function", file=stream)
+        for function, count in own_samples.most_common(top):
+            print(
+                f"{count:>8} {100 * count / total:>7.1f}%  {function}",
+                file=stream,
+            )
+        #
+
+
+# pylint: disable=too-few-public-methods ; just a descriptor
+class LazyReader:
+
+    """Descriptor providing a Reader for unit test classes.
+    The file is read on first access only,
+    and the Reader is shared with all other classes using the same file.
+    """
+
+    def __init__(self, file_name):
+        """Keep the file name"""
+        self.file_name = file_name
+
+    def __get__(self, instance, owner=None):
+        """Return the shared reader"""
+        return shared_reader(self.file_name)
+
+
+# pylint: enable
+
+
 # pylint: disable=too-few-public-methods ; just a mixin
 class TestMixin:
 
@@ -80,9 +336,11 @@ class TestMixin:
 #
 
 
-def initialize_puzzle():
-    """Initialize a puzzle: initialize logging,
-    and return a Reader object
+def parse_arguments(available_parts=None):
+    """Parse command line arguments, initialize logging,
+    and return the arguments namespace.
+    If available_parts is given, parts selected using --part
+    must be contained in it.
     """
     main_parser = argparse.ArgumentParser(
         prog=sys.argv[0],
@@ -97,16 +355,133 @@ def initialize_puzzle():
         dest="loglevel",
         help="output all messages including debug level",
     )
+    reading_mode = main_parser.add_mutually_exclusive_group()
+    reading_mode.add_argument(
+        "-m",
+        "--mmap",
+        action="store_true",
+        help="memory-map the input file instead of reading it at once",
+    )
+    reading_mode.add_argument(
+        "-s",
+        "--stream",
+        action="store_true",
+        help="process the input line by line as it arrives"
+        " instead of reading it at once (requires exactly one --part)",
+    )
+    main_parser.add_argument(
+        "-p",
+        "--part",
+        type=int,
+        action="append",
+        dest="parts",
+        help="solve only this part (may be specified multiple times)",
+    )
+    main_parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="profile each part using cProfile or a sampling profiler"
+        " (default: value of the AOC_PROFILE environment variable)",
+    )
+    main_parser.add_argument(
+        "--profile-dir",
+        help="write profiling data to this directory (default:"
+        " value of the AOC_PROFILE_DIR environment variable,"
+        f" or {PROFILING['directory']})",
+    )
+    main_parser.add_argument(
+        "--profile-top",
+        type=int,
+        help="print the top N functions of each profile (default:"
+        " value of the AOC_PROFILE_TOP environment variable,"
+        f" or {PROFILING['top']})",
+    )
     main_parser.add_argument(
         "input_file_name",
         nargs="?",
         help="read data from a file (default: read from stdin)",
     )
     arguments = main_parser.parse_args()
+    if arguments.mmap and not arguments.input_file_name:
+        main_parser.error("--mmap requires an input file name")
+    #
+    if available_parts is not None:
+        unavailable_parts = sorted(
+            set(arguments.parts or ()) - set(available_parts)
+        )
+        if unavailable_parts:
+            main_parser.error(
+                "No such part: "
+                + ", ".join(str(part) for part in unavailable_parts)
+                + " (available parts: "
+                + ", ".join(str(part) for part in sorted(available_parts))
+                + ")"
+            )
+        #
+    #
+    if arguments.profile is None:
+        arguments.profile = os.environ.get("AOC_PROFILE") or None
+        if arguments.profile not in (None,) + PROFILE_MODES:
+            main_parser.error(
+                f"Invalid AOC_PROFILE value {arguments.profile!r}"
+                f" (choose from {', '.join(PROFILE_MODES)})"
+            )
+        #
+    #
+    if arguments.profile_dir is None:
+        arguments.profile_dir = (
+            os.environ.get("AOC_PROFILE_DIR") or PROFILING["directory"]
+        )
+    #
+    if arguments.profile_top is None:
+        try:
+            arguments.profile_top = int(
+                os.environ.get("AOC_PROFILE_TOP") or PROFILING["top"]
+            )
+        except ValueError:
+            main_parser.error(
+                "Invalid AOC_PROFILE_TOP value"
+                f" {os.environ['AOC_PROFILE_TOP']!r} (integer required)"
+            )
+        #
+    #
+    if arguments.stream and len(arguments.parts or ()) != 1:
+        main_parser.error(
+            "--stream requires selecting exactly one part using --part,"
+            " because the input can be consumed only once"
+        )
+    #
     logging.basicConfig(
         level=arguments.loglevel,
         format="%(levelname)-8s | %(message)s",
     )
+    PROFILING.update(
+        mode=arguments.profile,
+        directory=arguments.profile_dir,
+        top=arguments.profile_top,
+    )
+    return arguments
+
+
+def initialize_puzzle(arguments=None):
+    """Initialize a puzzle: initialize logging,
+    and return a Reader object
+    """
+    if arguments is None:
+        arguments = parse_arguments()
+    #
+    if arguments.mmap:
+        return MappedReader(arguments.input_file_name)
+    #
+    if arguments.stream:
+        if arguments.input_file_name:
+            # pylint: disable=consider-using-with ; read until exit
+            return StreamReader(
+                open(arguments.input_file_name, mode="rt", encoding="utf-8")
+            )
+        #
+        return StreamReader()
+    #
     return Reader(arguments.input_file_name)
 
 
@@ -117,28 +492,271 @@ def based_mod(value, modulo, offset=1):
     return (value - offset) % modulo + offset
 
 
+@functools.lru_cache(maxsize=None)
+def shared_reader(file_name):
+    """Return a Reader for the file, shared by all callers"""
+    return Reader(file_name=file_name)
+
+
+def solution_days():
+    """Return a sorted list of all days having a solution module"""
+    days = []
+    for file_name in os.listdir(SOLUTIONS_DIRECTORY):
+        match = PRX_SOLUTION_MODULE.match(file_name)
+        if match:
+            days.append(int(match.group(1)))
+        #
+    #
+    return sorted(days)
+
+
+def load_solution(day):
+    """Import and return the solution module for the day"""
+    return importlib.import_module(f"day{day}")
+
+
+def input_file_name(day, example=False):
+    """Return the input file name for the day"""
+    suffix = "example" if example else "txt"
+    return os.path.join(INPUTS_DIRECTORY, f"{day}.{suffix}")
+
+
 def solve_puzzle(*functions):
     """Solve a puzzle: initialize it
     and print the return code of each function
     with the reader object from initialization
     """
-    reader = initialize_puzzle()
+    available_parts = []
+    for func in functions:
+        match = PRX_PART_FUNCTION.match(func.__name__)
+        if match:
+            available_parts.append(int(match.group(1)))
+        #
+    #
+    arguments = parse_arguments(available_parts=available_parts)
+    reader = initialize_puzzle(arguments)
+    if arguments.parts:
+        selected_names = {f"part{part}" for part in arguments.parts}
+        functions = [
+            func for func in functions if func.__name__ in selected_names
+        ]
+    #
     for func in functions:
         print(func(reader))
     #
 
 
+@functools.lru_cache(maxsize=None)
+def source_hash(module_name):
+    """Return a hash of the module’s source file,
+    or None if the module has no readable source file
+    (eg. __main__ in an interactive session or with python -c)
+    """
+    source_file_name = getattr(sys.modules.get(module_name), "__file__", None)
+    if not source_file_name:
+        return None
+    #
+    try:
+        with open(source_file_name, mode="rb") as source_file:
+            return hashlib.sha256(source_file.read()).hexdigest()
+        #
+    except OSError as error:
+        logging.debug("Could not read %s: %s", source_file_name, error)
+    #
+    return None
+
+
+def parse_cache_file_names(reader, func):
+    """Return a tuple of the name of the persistent cache file
+    for the result of func(reader), keyed by the hashes
+    of the input contents and of the parse function’s source module,
+    and a glob pattern matching all cache files for the same input
+    and parse function.
+    Raise a KeyError if the source module cannot be hashed.
+    """
+    module_hash = source_hash(func.__module__)
+    if module_hash is None:
+        raise KeyError(func.__module__)
+    #
+    input_directory, input_base_name = os.path.split(reader.file_name)
+    prefix = os.path.join(
+        input_directory,
+        PARSE_CACHE_DIRECTORY,
+        f"{input_base_name}.{func.__module__}.{func.__qualname__}",
+    )
+    key = hashlib.sha256(
+        " ".join(
+            (
+                reader.content_hash(),
+                module_hash,
+                f"{sys.version_info.major}.{sys.version_info.minor}",
+            )
+        ).encode("utf-8")
+    ).hexdigest()
+    return (
+        f"{prefix}.{key[:20]}.pickle",
+        f"{glob.escape(prefix)}.*.pickle",
+    )
+
+
+def load_parsed(cache_file_name):
+    """Return the parse result from the cache file.
+    Raise a KeyError if it is missing or unreadable.
+    """
+    try:
+        with open(cache_file_name, mode="rb") as cache_file:
+            return pickle.load(cache_file)
+        #
+    except (
+        OSError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        pickle.UnpicklingError,
+    ) as error:
+        raise KeyError(cache_file_name) from error
+    #
+
+
+def store_parsed(result, cache_file_name, stale_files_pattern):
+    """Store the parse result in the cache file
+    after removing outdated cache files.
+    Failures (including unpicklable results) are only logged,
+    and a partially written temporary file is removed.
+    """
+    cache_directory = os.path.dirname(cache_file_name)
+    temporary_file_name = None
+    try:
+        os.makedirs(cache_directory, exist_ok=True)
+        for stale_file_name in glob.glob(stale_files_pattern):
+            os.remove(stale_file_name)
+        #
+        with tempfile.NamedTemporaryFile(
+            mode="wb", dir=cache_directory, delete=False
+        ) as cache_file:
+            temporary_file_name = cache_file.name
+            pickle.dump(result, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        #
+        os.replace(temporary_file_name, cache_file_name)
+    # pylint: disable=broad-except ; pickling may raise nearly anything
+    except Exception as error:
+        logging.debug("Could not write %s: %s", cache_file_name, error)
+        if temporary_file_name:
+            try:
+                os.remove(temporary_file_name)
+            except OSError:
+                pass
+            #
+        #
+    #
+
+
+def cached_parser(func=None, persistent=False):
+    """Decorator for parse functions taking a reader as argument:
+    the result is computed only once per reader
+    and shared by all parts (and test methods) using the same reader.
+    Parse functions should therefore return immutable data
+    (eg. tuples) which the solvers build their working objects from.
+    Calling the decorated function with mutable=True returns
+    a deep copy of the result, which is often slower than parsing again.
+    If persistent is True, results for input files are additionally
+    pickled into a cache directory next to the input file,
+    and reused as long as neither the input nor the solver changes.
+    """
+    if func is None:
+        return functools.partial(cached_parser, persistent=persistent)
+    #
+
+    def parse(reader):
+        """Return the parse result, from the persistent cache if possible"""
+        if not all((persistent, PERSISTENT_PARSE_CACHE, reader.file_name)):
+            return func(reader)
+        #
+        try:
+            cache_file_name, stale_files_pattern = parse_cache_file_names(
+                reader, func
+            )
+        except KeyError:
+            return func(reader)
+        #
+        try:
+            result = load_parsed(cache_file_name)
+        except KeyError:
+            result = func(reader)
+            store_parsed(result, cache_file_name, stale_files_pattern)
+        else:
+            logging.debug("Loaded parse result from %s", cache_file_name)
+        #
+        return result
+
+    @functools.wraps(func)
+    def wrapper(reader, mutable=False):
+        try:
+            result = reader.parse_cache[func]
+        except KeyError:
+            result = reader.parse_cache[func] = parse(reader)
+        #
+        if mutable:
+            return copy.deepcopy(result)
+        #
+        return result
+
+    return wrapper
+
+
+def profiled_call(func, *args, **kwargs):
+    """Call func using the profiler selected in PROFILING,
+    write the profiling data to a file named after func’s module
+    and name, print the top functions and return func’s output
+    """
+    os.makedirs(PROFILING["directory"], exist_ok=True)
+    module_name = os.path.splitext(
+        os.path.basename(func.__code__.co_filename)
+    )[0]
+    file_stem = os.path.join(
+        PROFILING["directory"], f"{module_name}.{func.__name__}"
+    )
+    if PROFILING["mode"] == PROFILE_SAMPLE:
+        sampler = StackSampler(
+            threading.get_ident(), interval=PROFILING["interval"]
+        )
+        sampler.start()
+        try:
+            func_output = func(*args, **kwargs)
+        finally:
+            sampler.stop()
+        #
+        sampler.write_collapsed(f"{file_stem}.collapsed")
+        logging.info("Wrote collapsed stacks to %s.collapsed", file_stem)
+        sampler.print_top(PROFILING["top"])
+        return func_output
+    #
+    profiler = cProfile.Profile()
+    func_output = profiler.runcall(func, *args, **kwargs)
+    profiler.dump_stats(f"{file_stem}.prof")
+    logging.info("Wrote profile to %s.prof", file_stem)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats(
+        pstats.SortKey.TIME
+    ).print_stats(PROFILING["top"])
+    return func_output
+
+
 def timer(func):
     """Decorator to get execution time,
     shamelessly ripped off aocutils.py from
     <https://github.com/DeXtroTip/advent-of-code-2021>
     """
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
-        func_output = func(*args, **kwargs)
-        end = time.time()
-        msec = 1000 * (end - start)
+        start = time.perf_counter_ns()
+        if PROFILING["mode"]:
+            func_output = profiled_call(func, *args, **kwargs)
+        else:
+            func_output = func(*args, **kwargs)
+        #
+        end = time.perf_counter_ns()
+        msec = (end - start) / 1000000
         logging.info(
             "Executed %r in %.3f msec (%.1f µsec)",
             func.__doc__,
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Advent of code 2021
+Solve many days of blackstream-x’ solutions in one process
+(or concurrently in a process pool)
+and print a summary table of answers and timings
+"""
+
+
+import argparse
+import concurrent.futures
+import logging
+import sys
+import time
+
+import helpers
+
+
+#
+# Constants
+#
+
+
+RETURNCODE_OK = 0
+RETURNCODE_ERROR = 1
+
+DEFAULT_PARTS = (1, 2)
+
+
+#
+# Functions
+#
+
+
+def solve_day(day, parts=DEFAULT_PARTS, example=False):
+    """Solve the selected parts of the day,
+    return a list of (day, part, answer, nanoseconds) tuples.
+    If the day could not be solved, answer is an error message
+    and nanoseconds is None.
+    """
+    try:
+        module = helpers.load_solution(day)
+        reader = helpers.Reader(
+            file_name=helpers.input_file_name(day, example=example)
+        )
+    except (ImportError, OSError) as error:
+        return [(day, None, f"Error: {error}", None)]
+    #
+    rows = []
+    for part in parts:
+        try:
+            func = getattr(module, f"part{part}")
+        except AttributeError:
+            continue
+        #
+        start = time.perf_counter_ns()
+        try:
+            answer = func(reader)
+        # pylint: disable=broad-except ; report any error in the table
+        except Exception as error:
+            rows.append((day, part, f"Error: {error!r}", None))
+            continue
+        # pylint: enable
+        #
+        rows.append((day, part, answer, time.perf_counter_ns() - start))
+    #
+    return rows
+
+
+def solve_days(days, parts=DEFAULT_PARTS, example=False, jobs=1):
+    """Solve the days, in a process pool with the given number
+    of worker processes if jobs is greater than 1.
+    Return all result rows sorted by day and part.
+    """
+    rows = []
+    if jobs > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs
+        ) as executor:
+            futures = [
+                executor.submit(solve_day, day, parts=parts, example=example)
+                for day in days
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                rows.extend(future.result())
+            #
+        #
+    else:
+        for day in days:
+            rows.extend(solve_day(day, parts=parts, example=example))
+        #
+    #
+    return sorted(rows, key=lambda row: (row[0], row[1] or 0))
+
+
+def print_summary(rows, elapsed_ns):
+    """Print the summary table"""
+    print(f"{'Day':>4} {'Part':>4} {'Answer':<24} {'msec':>12}")
+    total_ns = 0
+    for (day, part, answer, nanoseconds) in rows:
+        if nanoseconds is None:
+            msec = "–"
+        else:
+            msec = f"{nanoseconds / 1000000:.3f}"
+            total_ns += nanoseconds
+        #
+        print(f"{day:>4} {part or '–':>4} {str(answer):<24} {msec:>12}")
+    #
+    print()
+    print(f"Sum of all part timings: {total_ns / 1000000:.3f} msec")
+    print(f"Total elapsed time:      {elapsed_ns / 1000000:.3f} msec")
+
+
+#
+# Main
+#
+
+
+def main():
+    """Parse arguments and solve the selected days"""
+    main_parser = argparse.ArgumentParser(
+        prog=sys.argv[0],
+        description="Advent of Code batch solver",
+    )
+    main_parser.set_defaults(loglevel=logging.WARNING)
+    main_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_const",
+        const=logging.DEBUG,
+        dest="loglevel",
+        help="output all messages including debug level",
+    )
+    main_parser.add_argument(
+        "-e",
+        "--example",
+        action="store_true",
+        help="use the example data instead of the puzzle data",
+    )
+    main_parser.add_argument(
+        "-p",
+        "--part",
+        type=int,
+        action="append",
+        dest="parts",
+        help="solve only this part (may be specified multiple times)",
+    )
+    main_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="solve the days concurrently in this number"
+        " of worker processes (default: %(default)s)",
+    )
+    main_parser.add_argument(
+        "days",
+        nargs="*",
+        type=int,
+        help="solve only these days (default: all days)",
+    )
+    arguments = main_parser.parse_args()
+    logging.basicConfig(
+        level=arguments.loglevel,
+        format="%(levelname)-8s | %(message)s",
+    )
+    start = time.perf_counter_ns()
+    rows = solve_days(
+        arguments.days or helpers.solution_days(),
+        parts=arguments.parts or DEFAULT_PARTS,
+        example=arguments.example,
+        jobs=arguments.jobs,
+    )
+    print_summary(rows, time.perf_counter_ns() - start)
+    if any(nanoseconds is None for (_, _, _, nanoseconds) in rows):
+        return RETURNCODE_ERROR
+    #
+    return RETURNCODE_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# vim: fileencoding=utf-8 sw=4 ts=4 sts=4 expandtab autoindent syntax=python:
@@ -0,0 +1,4 @@
+#!/bin/bash
+# Solve many days in one process
+
+python3 solutions/solve_all.py "$@"
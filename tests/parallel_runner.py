@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run the Advent of Code unittests in parallel:
+spread test modules or test cases across a process pool,
+merge their results into one report and print per-test durations
+"""
+
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+import unittest
+
+
+#
+# Constants
+#
+
+
+RETURNCODE_OK = 0
+RETURNCODE_ERROR = 1
+
+FAILED_IMPORT_PREFIX = "unittest.loader._FailedTest."
+
+GRANULARITY_CASE = "case"
+GRANULARITY_MODULE = "module"
+
+OUTCOME_SYMBOLS = dict(
+    ok=".",
+    fail="F",
+    error="E",
+    skip="s",
+    expected_failure="x",
+    unexpected_success="u",
+)
+FAILED_OUTCOMES = ("fail", "error", "unexpected_success")
+
+DEFAULT_DURATIONS = 10
+
+SEPARATOR_WIDE = "=" * 70
+SEPARATOR_THIN = "-" * 70
+
+
+#
+# Classes
+#
+
+
+class RecordingResult(unittest.TestResult):
+
+    """Test result recording outcome and duration of each test
+    in a picklable form
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the records"""
+        super().__init__(*args, **kwargs)
+        self.records = []
+        self.__start_time = None
+        self.__records_at_start = 0
+
+    def __record(self, test, outcome, details="", description=None):
+        """Record the outcome of the test"""
+        if description is None:
+            description = test.shortDescription() or ""
+        #
+        self.records.append(
+            dict(
+                test_id=test.id(),
+                description=description,
+                outcome=outcome,
+                details=details,
+                duration=time.perf_counter() - self.__start_time,
+            )
+        )
+
+    def startTest(self, test):
+        """Remember the start time"""
+        super().startTest(test)
+        self.__start_time = time.perf_counter()
+        self.__records_at_start = len(self.records)
+
+    def stopTest(self, test):
+        """Make sure the test did not finish without a record"""
+        if len(self.records) == self.__records_at_start:
+            self.__record(test, "error", "Test finished without an outcome")
+        #
+        super().stopTest(test)
+
+    def addSuccess(self, test):
+        """Record a success"""
+        super().addSuccess(test)
+        self.__record(test, "ok")
+
+    def addFailure(self, test, err):
+        """Record a failure"""
+        super().addFailure(test, err)
+        self.__record(test, "fail", self.failures[-1][1])
+
+    def addError(self, test, err):
+        """Record an error"""
+        super().addError(test, err)
+        self.__record(test, "error", self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        """Record a skipped test"""
+        super().addSkip(test, reason)
+        self.__record(test, "skip", reason)
+
+    def addExpectedFailure(self, test, err):
+        """Record an expected failure"""
+        super().addExpectedFailure(test, err)
+        self.__record(test, "expected_failure", self.expectedFailures[-1][1])
+
+    def addUnexpectedSuccess(self, test):
+        """Record an unexpected success"""
+        super().addUnexpectedSuccess(test)
+        self.__record(test, "unexpected_success")
+
+    def addSubTest(self, test, subtest, err):
+        """Record a failed or erroneous subtest under the parent test id
+        (successful subtests are covered by the parent test’s record)
+        """
+        super().addSubTest(test, subtest, err)
+        if err is None:
+            return
+        #
+        if issubclass(err[0], test.failureException):
+            outcome, details = "fail", self.failures[-1][1]
+        else:
+            outcome, details = "error", self.errors[-1][1]
+        #
+        self.__record(test, outcome, details, description=subtest.id())
+
+
+#
+# Functions
+#
+
+
+def iter_tests(suite):
+    """Yield all test cases from a (nested) test suite"""
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from iter_tests(item)
+        else:
+            yield item
+        #
+    #
+
+
+def collect_work_units(patterns, granularity):
+    """Discover the tests and return a list of work units,
+    each of them a list of test names loadable in a worker process
+    """
+    loader = unittest.TestLoader()
+    if patterns:
+        # Substring matching like in unittest’s own -k option
+        loader.testNamePatterns = [
+            pattern if "*" in pattern else f"*{pattern}*"
+            for pattern in patterns
+        ]
+    #
+    work_units = {}
+    for test in iter_tests(loader.discover(".")):
+        test_id = test.id()
+        if test_id.startswith(FAILED_IMPORT_PREFIX):
+            # Loading the module by name reproduces the import error
+            test_id = test_id[len(FAILED_IMPORT_PREFIX):]
+            unit_key = test_id
+        elif granularity == GRANULARITY_MODULE:
+            unit_key = test.__class__.__module__
+        else:
+            unit_key = test_id
+        #
+        work_units.setdefault(unit_key, []).append(test_id)
+    #
+    return list(work_units.values())
+
+
+def run_work_unit(test_names, failfast=False):
+    """Run the tests (in a worker process) and return the records"""
+    suite = unittest.TestLoader().loadTestsFromNames(test_names)
+    result = RecordingResult()
+    result.failfast = failfast
+    suite.run(result)
+    if len(test_names) == 1:
+        # Failed imports of a dotted module name are reported
+        # with the last name component only: restore the full name
+        for record in result.records:
+            if record["test_id"].startswith(FAILED_IMPORT_PREFIX):
+                record["test_id"] = f"{FAILED_IMPORT_PREFIX}{test_names[0]}"
+            #
+        #
+    #
+    return result.records
+
+
+def unrecorded_tests(work_units, records):
+    """Return the sorted list of collected test names
+    without any record
+    """
+    recorded = set()
+    for record in records:
+        test_id = record["test_id"]
+        if test_id.startswith(FAILED_IMPORT_PREFIX):
+            test_id = test_id[len(FAILED_IMPORT_PREFIX):]
+        #
+        recorded.add(test_id)
+    #
+    return sorted(
+        {test_name for test_names in work_units for test_name in test_names}
+        - recorded
+    )
+
+
+def print_record(record, verbose=False):
+    """Print progress for a finished test"""
+    if verbose:
+        print(
+            f"{record['test_id']} ... {record['outcome']}"
+            f" ({record['duration']:.3f}s)",
+            flush=True,
+        )
+    else:
+        print(OUTCOME_SYMBOLS[record["outcome"]], end="", flush=True)
+    #
+
+
+def print_report(records, elapsed_time, durations=DEFAULT_DURATIONS):
+    """Print failures, errors, the slowest test durations
+    (all if durations is 0) and a summary,
+    return True if all tests succeeded
+    """
+    print()
+    counts = dict.fromkeys(OUTCOME_SYMBOLS, 0)
+    for record in records:
+        counts[record["outcome"]] += 1
+        if record["outcome"] in FAILED_OUTCOMES:
+            print(SEPARATOR_WIDE)
+            print(f"{record['outcome'].upper()}: {record['test_id']}")
+            if record["description"]:
+                print(record["description"])
+            #
+            print(SEPARATOR_THIN)
+            print(record["details"])
+        #
+    #
+    print(SEPARATOR_THIN)
+    print("Durations (slowest first):")
+    slowest = sorted(
+        records, key=lambda record: record["duration"], reverse=True
+    )
+    for record in slowest[:durations or None]:
+        print(f"{record['duration']:10.3f}s  {record['test_id']}")
+    #
+    print(SEPARATOR_THIN)
+    test_count = len({record["test_id"] for record in records})
+    print(f"Ran {test_count} tests in {elapsed_time:.3f}s")
+    print()
+    problems = [
+        f"{label}={counts[outcome]}"
+        for (outcome, label) in (
+            ("fail", "failures"),
+            ("error", "errors"),
+            ("skip", "skipped"),
+            ("expected_failure", "expected failures"),
+            ("unexpected_success", "unexpected successes"),
+        )
+        if counts[outcome]
+    ]
+    success = not any(counts[outcome] for outcome in FAILED_OUTCOMES)
+    status = "OK" if success else "FAILED"
+    if problems:
+        status = f"{status} ({', '.join(problems)})"
+    #
+    print(status)
+    return success
+
+
+#
+# Main
+#
+
+
+def main():
+    """Parse arguments and run the tests in parallel"""
+    main_parser = argparse.ArgumentParser(
+        prog="run-tests.sh -j",
+        description="Run the unittests in parallel",
+    )
+    main_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="print each test with its outcome and duration",
+    )
+    main_parser.add_argument(
+        "-f",
+        "--failfast",
+        action="store_true",
+        help="stop on the first failure or error",
+    )
+    main_parser.add_argument(
+        "-k",
+        action="append",
+        dest="patterns",
+        help="only run tests matching the pattern"
+        " (may be specified multiple times)",
+    )
+    main_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes (default: %(default)s)",
+    )
+    main_parser.add_argument(
+        "-g",
+        "--granularity",
+        choices=(GRANULARITY_CASE, GRANULARITY_MODULE),
+        default=GRANULARITY_CASE,
+        help="distribute single test cases or whole test modules"
+        " to the workers (default: %(default)s)",
+    )
+    main_parser.add_argument(
+        "-d",
+        "--durations",
+        type=int,
+        default=DEFAULT_DURATIONS,
+        help="print the durations of the N slowest tests,"
+        " or of all tests if N is 0 (default: %(default)s)",
+    )
+    arguments = main_parser.parse_args()
+    start_time = time.perf_counter()
+    work_units = collect_work_units(arguments.patterns, arguments.granularity)
+    records = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=arguments.workers
+    ) as executor:
+        futures = [
+            executor.submit(
+                run_work_unit, test_names, failfast=arguments.failfast
+            )
+            for test_names in work_units
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            for record in future.result():
+                print_record(record, verbose=arguments.verbose)
+                records.append(record)
+            #
+            if arguments.failfast and any(
+                record["outcome"] in FAILED_OUTCOMES for record in records
+            ):
+                executor.shutdown(cancel_futures=True)
+                break
+            #
+        #
+    #
+    success = print_report(
+        records,
+        time.perf_counter() - start_time,
+        durations=arguments.durations,
+    )
+    if not arguments.failfast:
+        missing_tests = unrecorded_tests(work_units, records)
+        if missing_tests:
+            print(f"{len(missing_tests)} tests did not record any outcome:")
+            for test_name in missing_tests:
+                print(f"  {test_name}")
+            #
+            success = False
+        #
+    #
+    if success:
+        return RETURNCODE_OK
+    #
+    return RETURNCODE_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+# vim: fileencoding=utf-8 sw=4 ts=4 sts=4 expandtab autoindent syntax=python:
@@ -25,7 +25,7 @@ class TestExample(unittest.TestCase, helpers.TestMixin):
 
     """Day 11: Test solutions using the example"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE)
+    reader = helpers.LazyReader(EXAMPLE_FILE)
     results = EXAMPLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -42,7 +42,7 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
 
     """Day 11: Test solutions using the puzzle"""
 
-    reader = helpers.Reader(file_name=PUZZLE_FILE)
+    reader = helpers.LazyReader(PUZZLE_FILE)
     results = PUZZLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -53,3 +53,74 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
     def test_2(self):
         """Day 11: Test part 2 with puzzle data"""
         self.do_equality_test(1)
+
+
+class TestOctopusGrid(unittest.TestCase):
+
+    """Day 11: Test all available octopus grid engines"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE)
+
+    def test_first_step(self):
+        """Day 11: Test the grid after the first step"""
+        for engine in current_day.ENGINES:
+            with self.subTest(engine=engine):
+                grid = current_day.load_grid(self.reader, engine=engine)
+                self.assertEqual(grid.step(), 0)
+                self.assertEqual(
+                    list(grid.draw()),
+                    [
+                        "6594254334",
+                        "3856965822",
+                        "6375667284",
+                        "7252447257",
+                        "7468496589",
+                        "5278635756",
+                        "3287952832",
+                        "7993992245",
+                        "5957959665",
+                        "6394862637",
+                    ],
+                )
+            #
+        #
+
+    def test_engines(self):
+        """Day 11: Test all engines with the example results"""
+        for engine in current_day.ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(
+                    current_day.load_grid(
+                        self.reader, engine=engine
+                    ).total_flashes_after(100),
+                    EXAMPLE_RESULTS[0],
+                )
+                self.assertEqual(
+                    current_day.load_grid(
+                        self.reader, engine=engine
+                    ).first_synchronized_step(),
+                    EXAMPLE_RESULTS[1],
+                )
+            #
+        #
+
+    def test_large_grid(self):
+        """Day 11: Test that all engines produce the same flash counts
+        on a larger grid
+        """
+        lines = [
+            line * 8 for line in current_day.parse_grid(self.reader)
+        ] * 8
+        flash_counts = {}
+        for engine in current_day.ENGINES:
+            grid = current_day.ENGINES[engine]()
+            for line in lines:
+                grid.add_line(line)
+            #
+            flash_counts[engine] = [grid.step() for _ in range(200)]
+        #
+        for engine, counts in flash_counts.items():
+            with self.subTest(engine=engine):
+                self.assertEqual(counts, flash_counts["flat"])
+            #
+        #
@@ -29,7 +29,7 @@ class TestExample(unittest.TestCase, helpers.TestMixin):
 
     """Day 12: Test solutions using the example"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE)
+    reader = helpers.LazyReader(EXAMPLE_FILE)
     results = EXAMPLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -46,7 +46,7 @@ class TestExample2(TestExample):
 
     """Day 12: Test solutions using the example #2"""
 
-    reader = helpers.Reader(file_name=EXAMPLE2_FILE)
+    reader = helpers.LazyReader(EXAMPLE2_FILE)
     results = EXAMPLE2_RESULTS
 
 
@@ -54,7 +54,7 @@ class TestExample3(TestExample):
 
     """Day 12: Test solutions using the example #3"""
 
-    reader = helpers.Reader(file_name=EXAMPLE3_FILE)
+    reader = helpers.LazyReader(EXAMPLE3_FILE)
     results = EXAMPLE3_RESULTS
 
 
@@ -62,7 +62,7 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
 
     """Day 12: Test solutions using the puzzle"""
 
-    reader = helpers.Reader(file_name=PUZZLE_FILE)
+    reader = helpers.LazyReader(PUZZLE_FILE)
     results = PUZZLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
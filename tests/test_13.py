@@ -25,7 +25,7 @@ class TestExample(unittest.TestCase, helpers.TestMixin):
 
     """Day 13: Test solutions using the example"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE)
+    reader = helpers.LazyReader(EXAMPLE_FILE)
     results = EXAMPLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -42,7 +42,7 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
 
     """Day 13: Test solutions using the puzzle"""
 
-    reader = helpers.Reader(file_name=PUZZLE_FILE)
+    reader = helpers.LazyReader(PUZZLE_FILE)
     results = PUZZLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -25,7 +25,7 @@ class TestExample(unittest.TestCase, helpers.TestMixin):
 
     """Day 15: Test solutions using the example"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE)
+    reader = helpers.LazyReader(EXAMPLE_FILE)
     results = EXAMPLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -42,7 +42,7 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
 
     """Day 15: Test solutions using the puzzle"""
 
-    reader = helpers.Reader(file_name=PUZZLE_FILE)
+    reader = helpers.LazyReader(PUZZLE_FILE)
     results = PUZZLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -53,3 +53,90 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
     def test_2(self):
         """Day 15: Test part 2 with puzzle data"""
         self.do_equality_test(1)
+
+
+class TestEngines(unittest.TestCase):
+
+    """Day 15: Test all path cost engines using the example"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE)
+
+    def test_engines(self):
+        """Day 15: Test all engines on the base and the tiled map"""
+        base_map = current_day.parse_density_map(self.reader)
+        tiled_map = current_day.TiledChitonDensityMap(base_map, 5)
+        for engine in current_day.ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(
+                    EXAMPLE_RESULTS,
+                    (
+                        current_day.get_cost(base_map, engine=engine),
+                        current_day.get_cost(tiled_map, engine=engine),
+                    ),
+                )
+            #
+        #
+
+
+class TestPathFinder(unittest.TestCase):
+
+    """Day 15: Test path cost queries using the example"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE)
+
+    def test_queries(self):
+        """Day 15: Test bidirectional and tree based queries"""
+        density_map = current_day.TiledChitonDensityMap(
+            current_day.parse_density_map(self.reader), 5
+        )
+        path_finder = current_day.PathFinder(density_map)
+        end_point = density_map.end_point
+        self.assertEqual(
+            EXAMPLE_RESULTS[1], path_finder.cost((0, 0), end_point)
+        )
+        path = path_finder.path((0, 0), end_point)
+        self.assertEqual(
+            EXAMPLE_RESULTS[1],
+            sum(
+                density_map.risks[density_map.index(position)]
+                for position in path[1:]
+            ),
+        )
+        for start, end in (
+            ((3, 7), (42, 11)),
+            ((42, 11), (3, 7)),
+            ((49, 0), (0, 49)),
+            ((25, 25), (26, 25)),
+        ):
+            with self.subTest(start=start, end=end):
+                tree_costs = path_finder.shortest_path_tree(start)[0]
+                self.assertEqual(
+                    tree_costs[density_map.index(end)],
+                    path_finder.bidirectional_cost(
+                        density_map.index(start), density_map.index(end)
+                    ),
+                )
+            #
+        #
+
+    def test_outside_positions(self):
+        """Day 15: Test rejection of positions outside the map"""
+        path_finder = current_day.PathFinder(
+            current_day.parse_density_map(self.reader)
+        )
+        for position in ((10, 0), (0, 10), (-1, 0), (0, -1), (10, 10)):
+            with self.subTest(position=position):
+                self.assertRaises(
+                    ValueError, path_finder.cost, (0, 0), position
+                )
+                self.assertRaises(
+                    ValueError, path_finder.cost, position, (0, 0)
+                )
+                self.assertRaises(
+                    ValueError, path_finder.path, (0, 0), position
+                )
+                self.assertRaises(
+                    ValueError, path_finder.shortest_path_tree, position
+                )
+            #
+        #
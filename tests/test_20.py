@@ -25,7 +25,7 @@ class TestExample(unittest.TestCase, helpers.TestMixin):
 
     """Day 20: Test solutions using the example"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE)
+    reader = helpers.LazyReader(EXAMPLE_FILE)
     results = EXAMPLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -42,7 +42,7 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
 
     """Day 20: Test solutions using the puzzle"""
 
-    reader = helpers.Reader(file_name=PUZZLE_FILE)
+    reader = helpers.LazyReader(PUZZLE_FILE)
     results = PUZZLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -53,3 +53,82 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
     def test_2(self):
         """Day 20: Test part 2 with puzzle data"""
         self.do_equality_test(1)
+
+
+class TestEngines(unittest.TestCase):
+
+    """Day 20: Test all available image engines using the example"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE)
+
+    def test_engines(self):
+        """Day 20: Test all engines with 2 and 50 enhancements"""
+        for engine in current_day.ENGINES:
+            with self.subTest(engine=engine):
+                image = current_day.load_image(self.reader, engine=engine)
+                results = []
+                for steps in (2, 48):
+                    for _ in range(steps):
+                        image.enhance()
+                    #
+                    results.append(image.lit_pixels())
+                #
+                self.assertEqual(EXAMPLE_RESULTS, tuple(results))
+            #
+        #
+
+    def test_bounding_box(self):
+        """Day 20: Test bounding box tracking of the bit rows engine"""
+        image = current_day.load_image(self.reader, engine="bitrows")
+        for _ in range(50):
+            image.enhance()
+        #
+        self.assertEqual(len(image.step_statistics), 50)
+        self.assertLessEqual(image.width, 5 + 2 * 50)
+        self.assertLessEqual(image.height, 5 + 2 * 50)
+        self.assertTrue(image.rows[0] and image.rows[-1])
+        self.assertTrue(any(row >> (image.width - 1) for row in image.rows))
+        self.assertTrue(any(row & 1 for row in image.rows))
+
+    @unittest.skipIf(
+        "numpy" not in current_day.ENGINES, "NumPy is not available"
+    )
+    def test_numpy_bounding_box(self):
+        """Day 20: Test bounding box tracking of the NumPy engine
+        against the bit rows engine
+        """
+        for file_name in (EXAMPLE_FILE, PUZZLE_FILE):
+            reader = helpers.Reader(file_name=file_name)
+            images = [
+                current_day.load_image(reader, engine=engine)
+                for engine in ("bitrows", "numpy")
+            ]
+            for step in range(1, 8):
+                for image in images:
+                    image.enhance()
+                #
+                with self.subTest(file_name=file_name, step=step):
+                    self.assertEqual(
+                        *[
+                            (
+                                image.min_x,
+                                image.min_y,
+                                image.width,
+                                image.height,
+                                image.infinity_value,
+                            )
+                            for image in images
+                        ]
+                    )
+                    self.assertEqual(
+                        *[
+                            [
+                                dict(statistics, nanoseconds=None)
+                                for statistics in image.step_statistics
+                            ]
+                            for image in images
+                        ]
+                    )
+                #
+            #
+        #
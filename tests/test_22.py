@@ -27,7 +27,7 @@ class TestExample0(unittest.TestCase, helpers.TestMixin):
 
     """Day 22: Test solutions using the example 0"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE_0)
+    reader = helpers.LazyReader(EXAMPLE_FILE_0)
     results = EXAMPLE_RESULTS_0
     tested_functions = TESTED_FUNCTIONS
 
@@ -40,7 +40,7 @@ class TestExample2(unittest.TestCase, helpers.TestMixin):
 
     """Day 22: Test solutions using the example"""
 
-    reader = helpers.Reader(file_name=EXAMPLE_FILE)
+    reader = helpers.LazyReader(EXAMPLE_FILE)
     results = EXAMPLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -57,7 +57,7 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
 
     """Day 22: Test solutions using the puzzle"""
 
-    reader = helpers.Reader(file_name=PUZZLE_FILE)
+    reader = helpers.LazyReader(PUZZLE_FILE)
     results = PUZZLE_RESULTS
     tested_functions = TESTED_FUNCTIONS
 
@@ -68,3 +68,183 @@ class TestPuzzle(unittest.TestCase, helpers.TestMixin):
     def test_2(self):
         """Day 22: Test part 2 with puzzle data"""
         self.do_equality_test(1)
+
+
+class TestEngines(unittest.TestCase):
+
+    """Day 22: Test all reactor engines"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE_0)
+
+    def test_mini_example(self):
+        """Day 22: Test all engines with the mini example"""
+        for engine in current_day.ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(
+                    current_day.operate_reactor(
+                        current_day.MINI_TEST_DATA.splitlines, engine=engine
+                    ),
+                    current_day.EXPECTED_MINI_TEST_RESULT,
+                )
+            #
+        #
+
+    def test_example_0(self):
+        """Day 22: Test all engines with example 0"""
+        for engine in current_day.ENGINES:
+            with self.subTest(engine=engine):
+                self.assertEqual(
+                    current_day.operate_reactor(
+                        self.reader.lines,
+                        limits=current_day.INITIALIZATION_AREA,
+                        engine=engine,
+                    ),
+                    EXAMPLE_RESULTS_0[0],
+                )
+            #
+        #
+
+
+class TestCuboid(unittest.TestCase):
+
+    """Day 22: Test the cuboid class"""
+
+    def test_split(self):
+        """Day 22: Test splitting a cuboid"""
+        cuboid = current_day.Cuboid(x=(2, 5), y=(6, 7), z=(0, 1))
+        split_cuboids = cuboid.split(x=(3, 4))
+        self.assertEqual(
+            sorted(piece.bounds for piece in split_cuboids),
+            [(2, 2, 6, 7, 0, 1), (3, 3, 6, 7, 0, 1), (4, 5, 6, 7, 0, 1)],
+        )
+        self.assertEqual(
+            sum(piece.volume() for piece in split_cuboids), cuboid.volume()
+        )
+
+    def test_subtract(self):
+        """Day 22: Test subtracting cuboids"""
+        cuboid = current_day.Cuboid(x=(0, 3), y=(0, 3), z=(0, 3))
+        hole = current_day.Cuboid(x=(1, 2), y=(1, 1), z=(-5, 1))
+        remaining = cuboid - hole
+        self.assertEqual(sum(piece.volume() for piece in remaining), 60)
+        self.assertTrue(
+            all(piece.intersection(hole) is None for piece in remaining)
+        )
+        self.assertEqual(cuboid - cuboid, [])
+        self.assertEqual(
+            hash(cuboid),
+            hash(current_day.Cuboid.from_bounds(cuboid.bounds)),
+        )
+
+
+class TestCuboidIndex(unittest.TestCase):
+
+    """Day 22: Test the spatial index"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE)
+
+    def test_pop_intersecting(self):
+        """Day 22: Test finding intersecting cuboids of all sizes
+        against a brute force search
+        """
+        cuboids = [
+            current_day.Cuboid.from_string(line.split(None, 1)[1])
+            for line in self.reader.lines()
+        ]
+        for other in cuboids:
+            index = current_day.CuboidIndex()
+            for cuboid in cuboids:
+                index.add(cuboid)
+            #
+            expected = [
+                cuboid
+                for cuboid in cuboids
+                if cuboid.intersection(other) is not None
+            ]
+            with self.subTest(other=other):
+                self.assertEqual(
+                    sorted(
+                        cuboid.bounds
+                        for cuboid in index.pop_intersecting(other)
+                    ),
+                    sorted(cuboid.bounds for cuboid in expected),
+                )
+                self.assertEqual(len(index), len(cuboids) - len(expected))
+                self.assertEqual(index.pop_intersecting(other), [])
+            #
+        #
+
+    def test_remove(self):
+        """Day 22: Test removing cuboids"""
+        index = current_day.CuboidIndex()
+        cuboid = current_day.Cuboid(x=(-3, 7), y=(0, 0), z=(2, 100))
+        index.add(cuboid)
+        index.remove(cuboid)
+        self.assertEqual(len(index), 0)
+        self.assertRaises(ValueError, index.remove, cuboid)
+
+
+class TestIncrementalReactor(unittest.TestCase):
+
+    """Day 22: Test the incremental reactor"""
+
+    reader = helpers.LazyReader(EXAMPLE_FILE)
+
+    def test_volumes(self):
+        """Day 22: Test the volume after each step
+        against the inclusion-exclusion reactor
+        """
+        reference = current_day.InclusionExclusionReactor()
+        volume = None
+        for line, volume in current_day.monitor_reactor(self.reader.lines):
+            instruction, coordinates = line.split(None, 1)
+            reference.switch(
+                instruction == "on",
+                current_day.Cuboid.from_string(coordinates),
+            )
+            self.assertEqual(volume, reference.volume)
+        #
+        self.assertEqual(volume, EXAMPLE_RESULTS[1])
+
+    def test_malformed_lines(self):
+        """Day 22: Test that malformed lines are skipped"""
+        lines = (
+            "on x=10..12,y=10..12,z=10..12",
+            "on x=1a..13,y=11..13,z=11..13",
+            "off",
+            "on x=11..13,y=11..13,z=11..13",
+        )
+        with self.assertLogs(level="ERROR") as logged:
+            self.assertEqual(
+                [
+                    volume
+                    for _, volume in current_day.monitor_reactor(
+                        lambda: iter(lines)
+                    )
+                ],
+                [27, 46],
+            )
+        #
+        self.assertEqual(len(logged.records), 2)
+
+    def test_undo(self):
+        """Day 22: Test undo and snapshots"""
+        reactor = current_day.IncrementalReactor(undo_limit=10)
+        volumes = [
+            volume
+            for _, volume in current_day.monitor_reactor(
+                self.reader.lines, reactor=reactor
+            )
+        ]
+        self.assertEqual(volumes[-1], EXAMPLE_RESULTS[1])
+        self.assertEqual(reactor.undo(), volumes[-2])
+        snapshot = reactor.snapshot()
+        self.assertEqual(reactor.undo(4), volumes[-6])
+        self.assertEqual(reactor.restore(snapshot - 9), volumes[-11])
+        with self.assertRaises(ValueError):
+            reactor.undo()
+        #
+        self.assertEqual(
+            reactor.volume,
+            sum(cuboid.volume() for cuboid in reactor.cuboids),
+        )
@@ -23,7 +23,7 @@ class TestExample(unittest.TestCase):
 
     """Test solutions using the example"""
 
-    example_reader = helpers.Reader(file_name=f"inputs/{DAY}.example")
+    example_reader = helpers.LazyReader(f"inputs/{DAY}.example")
 
     def test_part_1_example(self):
         """Test part 1 with example data"""
@@ -45,7 +45,7 @@ class TestPuzzle(unittest.TestCase):
 
     """Test solutions using the puzzle"""
 
-    puzzle_reader = helpers.Reader(file_name=f"inputs/{DAY}.txt")
+    puzzle_reader = helpers.LazyReader(f"inputs/{DAY}.txt")
 
     def test_part_1_puzzle(self):
         """Test part 1 with puzzle data"""
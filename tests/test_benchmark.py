@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test the Advent of Code benchmark module
+"""
+
+import contextlib
+import io
+import unittest
+
+import benchmark
+
+
+def make_result(day, part, answer, median_ns=1000000):
+    """Return a benchmark result as written by benchmark_day()"""
+    return dict(
+        runs=5,
+        min_ns=median_ns,
+        median_ns=median_ns,
+        p95_ns=median_ns,
+        peak_memory_bytes=1024,
+        answer=answer,
+        day=day,
+        part=part,
+    )
+
+
+class TestPercentile(unittest.TestCase):
+
+    """Benchmark: Test the nearest rank percentile"""
+
+    def test_percentile(self):
+        """Benchmark: percentiles of a few sorted values"""
+        values = [10, 20, 30, 40, 50]
+        for percent, expected in (
+            (0, 10),
+            (20, 10),
+            (21, 20),
+            (50, 30),
+            (95, 50),
+            (100, 50),
+        ):
+            with self.subTest(percent=percent):
+                self.assertEqual(
+                    benchmark.percentile(values, percent), expected
+                )
+            #
+        #
+
+    def test_single_value(self):
+        """Benchmark: percentiles of a single value"""
+        self.assertEqual(benchmark.percentile([7], 95), 7)
+
+
+class TestCheckAnswers(unittest.TestCase):
+
+    """Benchmark: Test checking answers against tests/test_N.py"""
+
+    def test_answers(self):
+        """Benchmark: wrong answers are reported, unknown ones ignored"""
+        results = {
+            "day9.part1": make_result(9, 1, 15),
+            "day9.part2": make_result(9, 2, 1135),
+            "day3.part1": make_result(3, 1, 198),
+            "day3.part2": make_result(3, 2, 231),
+        }
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(
+                benchmark.check_answers(results, example=True),
+                ["day9.part2", "day3.part2"],
+            )
+        #
+
+    def test_puzzle_answers(self):
+        """Benchmark: puzzle answers are checked against
+        the puzzle results
+        """
+        results = {"day9.part1": make_result(9, 1, 631)}
+        self.assertEqual(benchmark.check_answers(results), [])
+        self.assertEqual(
+            benchmark.check_answers(results, example=True), ["day9.part1"]
+        )
+
+
+class TestCompareWithBaseline(unittest.TestCase):
+
+    """Benchmark: Test the comparison with a baseline"""
+
+    baseline = {
+        "day1.part1": make_result(1, 1, 7),
+        "day1.part2": make_result(1, 2, 5),
+        "day2.part1": make_result(2, 1, 150),
+    }
+
+    def compare(self, results, **kwargs):
+        """Return the regressions, discarding printed output"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return benchmark.compare_with_baseline(
+                results, self.baseline, **kwargs
+            )
+        #
+
+    def test_unchanged(self):
+        """Benchmark: no regressions for unchanged results"""
+        self.assertEqual(self.compare(dict(self.baseline)), [])
+
+    def test_slower(self):
+        """Benchmark: slowdowns above the threshold are regressions"""
+        results = dict(self.baseline)
+        results["day1.part1"] = make_result(1, 1, 7, median_ns=1050000)
+        results["day1.part2"] = make_result(1, 2, 5, median_ns=1200000)
+        self.assertEqual(self.compare(results), ["day1.part2"])
+        self.assertEqual(self.compare(results, threshold=25), [])
+        self.assertEqual(
+            self.compare(results, threshold=2), ["day1.part1", "day1.part2"]
+        )
+
+    def test_answer_changed(self):
+        """Benchmark: changed answers are regressions"""
+        results = dict(self.baseline)
+        results["day2.part1"] = make_result(2, 1, 151, median_ns=1)
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(self.compare(results), ["day2.part1"])
+        #
+
+    def test_missing(self):
+        """Benchmark: baseline parts of the selected days
+        missing from the results are regressions
+        """
+        results = {"day1.part1": self.baseline["day1.part1"]}
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(
+                self.compare(results), ["day1.part2", "day2.part1"]
+            )
+        #
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(
+                self.compare(results, days=[1]), ["day1.part2"]
+            )
+        #
+        self.assertEqual(self.compare(results, days=[3]), [])
+
+    def test_not_in_baseline(self):
+        """Benchmark: parts not in the baseline are no regressions"""
+        results = dict(self.baseline)
+        results["day3.part1"] = make_result(3, 1, 198)
+        self.assertEqual(self.compare(results), [])
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+
+"""
+Test the Advent of Code helpers module
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import helpers
+
+
+SAMPLE_TEXT = "abc def\n\n  12 34  \r\nlast line"
+
+
+class TestMappedReader(unittest.TestCase):
+
+    """Helpers: Test the memory-mapped reader"""
+
+    def setUp(self):
+        """Write the sample text to a temporary file"""
+        file_descriptor, self.file_name = tempfile.mkstemp()
+        with os.fdopen(file_descriptor, mode="wb") as sample_file:
+            sample_file.write(SAMPLE_TEXT.encode("utf-8"))
+        #
+
+    def tearDown(self):
+        """Remove the temporary file"""
+        os.remove(self.file_name)
+
+    def test_lines(self):
+        """Helpers: mapped lines match the lines of the plain reader"""
+        reader = helpers.Reader(text=SAMPLE_TEXT)
+        mapped_reader = helpers.MappedReader(self.file_name)
+        for rstrip in (True, False):
+            for skip_empty in (True, False):
+                self.assertEqual(
+                    list(reader.lines(rstrip=rstrip, skip_empty=skip_empty)),
+                    list(
+                        mapped_reader.lines(
+                            rstrip=rstrip, skip_empty=skip_empty
+                        )
+                    ),
+                )
+            #
+        #
+
+    def test_raw_lines(self):
+        """Helpers: undecoded mapped lines are memoryview slices"""
+        mapped_reader = helpers.MappedReader(self.file_name, decode=False)
+        lines = list(mapped_reader.lines())
+        self.assertTrue(all(isinstance(line, memoryview) for line in lines))
+        self.assertEqual(
+            [line.tobytes() for line in lines],
+            [b"abc def", b"  12 34", b"last line"],
+        )
+        self.assertEqual(
+            list(mapped_reader.splitted_lines()),
+            [[b"abc", b"def"], [b"12", b"34"], [b"last", b"line"]],
+        )
+
+    def test_empty_file(self):
+        """Helpers: an empty file yields no lines"""
+        with open(self.file_name, mode="wb"):
+            pass
+        #
+        mapped_reader = helpers.MappedReader(self.file_name)
+        self.assertEqual(list(mapped_reader.lines()), [])
+
+
+class TestStreamReader(unittest.TestCase):
+
+    """Helpers: Test the streaming reader"""
+
+    def test_lines(self):
+        """Helpers: streamed lines match the lines of the plain reader"""
+        reader = helpers.Reader(text=SAMPLE_TEXT)
+        stream_reader = helpers.StreamReader(io.StringIO(SAMPLE_TEXT))
+        self.assertEqual(
+            list(reader.splitted_lines()),
+            list(stream_reader.splitted_lines()),
+        )
+
+    def test_consumed_only_once(self):
+        """Helpers: a stream cannot be consumed twice"""
+        stream_reader = helpers.StreamReader(io.StringIO(SAMPLE_TEXT))
+        list(stream_reader.lines())
+        with self.assertRaises(ValueError):
+            list(stream_reader.lines())
+        #
+
+
+class TestCachedParser(unittest.TestCase):
+
+    """Helpers: Test the parse cache"""
+
+    def setUp(self):
+        """Define a counting parse function"""
+        self.calls = 0
+
+        @helpers.cached_parser
+        def parse_words(reader):
+            """Return the words of each line"""
+            self.calls += 1
+            return list(reader.splitted_lines())
+
+        self.parse_words = parse_words
+
+    def test_shared(self):
+        """Helpers: the parse function is called once per reader"""
+        reader = helpers.Reader(text=SAMPLE_TEXT)
+        first_result = self.parse_words(reader)
+        self.assertIs(first_result, self.parse_words(reader))
+        self.assertEqual(self.calls, 1)
+        self.parse_words(helpers.Reader(text=SAMPLE_TEXT))
+        self.assertEqual(self.calls, 2)
+
+    def test_mutable(self):
+        """Helpers: mutable results are deep copies of the cached result"""
+        reader = helpers.Reader(text=SAMPLE_TEXT)
+        mutable_result = self.parse_words(reader, mutable=True)
+        mutable_result[0].append("ghi")
+        self.assertEqual(self.parse_words(reader)[0], ["abc", "def"])
+        self.assertEqual(self.calls, 1)
+
+
+class TestPersistentParseCache(unittest.TestCase):
+
+    """Helpers: Test the persistent parse cache"""
+
+    def setUp(self):
+        """Write the sample text to a file in a temporary directory
+        and define a counting parse function
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "sample.txt")
+        self.write_sample(SAMPLE_TEXT)
+        self.calls = 0
+
+        @helpers.cached_parser(persistent=True)
+        def parse_lines(reader):
+            """Return the lines"""
+            self.calls += 1
+            return list(reader.lines())
+
+        self.parse_lines = parse_lines
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.directory.cleanup()
+
+    def write_sample(self, text):
+        """Write text to the sample file"""
+        with open(self.file_name, mode="wt", encoding="utf-8") as sample:
+            sample.write(text)
+        #
+
+    def test_reuse(self):
+        """Helpers: parse results are reused across readers"""
+        first_result = self.parse_lines(
+            helpers.Reader(file_name=self.file_name)
+        )
+        second_result = self.parse_lines(
+            helpers.Reader(file_name=self.file_name)
+        )
+        self.assertEqual(first_result, second_result)
+        self.assertEqual(self.calls, 1)
+
+    def test_invalidation(self):
+        """Helpers: changed input is parsed again,
+        and the outdated cache file is removed
+        """
+        self.parse_lines(helpers.Reader(file_name=self.file_name))
+        self.write_sample("changed")
+        self.assertEqual(
+            self.parse_lines(helpers.Reader(file_name=self.file_name)),
+            ["changed"],
+        )
+        self.assertEqual(self.calls, 2)
+        cache_directory = os.path.join(
+            self.directory.name, helpers.PARSE_CACHE_DIRECTORY
+        )
+        self.assertEqual(len(os.listdir(cache_directory)), 1)
+
+    def test_unpicklable(self):
+        """Helpers: unpicklable results are returned but not stored,
+        and no temporary files are left behind
+        """
+
+        @helpers.cached_parser(persistent=True)
+        def parse_generator(reader):
+            """Return a generator"""
+            self.calls += 1
+            return (line for line in reader.lines())
+
+        result = parse_generator(helpers.Reader(file_name=self.file_name))
+        self.assertEqual(list(result), ["abc def", "  12 34", "last line"])
+        self.assertEqual(self.calls, 1)
+        cache_directory = os.path.join(
+            self.directory.name, helpers.PARSE_CACHE_DIRECTORY
+        )
+        self.assertEqual(os.listdir(cache_directory), [])
+
+    def test_no_source_file(self):
+        """Helpers: parse functions from modules without a source file
+        are not cached persistently
+        """
+        module_name = "aoc_module_without_source"
+        sys.modules[module_name] = types.ModuleType(module_name)
+        self.addCleanup(sys.modules.pop, module_name)
+
+        def parse_words(reader):
+            """Return the words"""
+            self.calls += 1
+            return tuple(reader.splitted_lines())
+
+        parse_words.__module__ = module_name
+        parse_words = helpers.cached_parser(parse_words, persistent=True)
+        parse_words(helpers.Reader(file_name=self.file_name))
+        self.assertEqual(self.calls, 1)
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(
+                    self.directory.name, helpers.PARSE_CACHE_DIRECTORY
+                )
+            )
+        )
+
+
+class TestLazyReader(unittest.TestCase):
+
+    """Helpers: Test the lazy reader descriptor"""
+
+    def test_shared(self):
+        """Helpers: readers are created on first access and shared"""
+        file_name = "inputs/1.txt"
+        helpers.shared_reader.cache_clear()
+
+        # pylint: disable=too-few-public-methods ; just for testing
+        class FirstUser:
+            """Class using the lazy reader"""
+
+            reader = helpers.LazyReader(file_name)
+
+        class SecondUser:
+            """Another class using the lazy reader"""
+
+            reader = helpers.LazyReader(file_name)
+
+        # pylint: enable
+
+        self.assertEqual(helpers.shared_reader.cache_info().currsize, 0)
+        self.assertIs(FirstUser.reader, SecondUser().reader)
+        self.assertEqual(helpers.shared_reader.cache_info().currsize, 1)
+
+
+class TestParseArguments(unittest.TestCase):
+
+    """Helpers: Test command line and environment parsing"""
+
+    def parse(self, environment, *options):
+        """Return the parsed arguments for the options
+        with the environment variables set
+        """
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                mock.patch.object(sys, "argv", ["dayN.py", *options])
+            )
+            stack.enter_context(mock.patch.dict(os.environ, environment))
+            stack.enter_context(mock.patch.dict(helpers.PROFILING))
+            # Leave the logging configuration of the test run alone
+            stack.enter_context(mock.patch.object(logging, "basicConfig"))
+            return helpers.parse_arguments()
+        #
+
+    def assert_usage_error(self, environment, message, *options):
+        """Assert that parsing exits with a usage error
+        containing the message
+        """
+        error_output = io.StringIO()
+        with contextlib.redirect_stderr(error_output):
+            with self.assertRaises(SystemExit) as context:
+                self.parse(environment, *options)
+            #
+        #
+        self.assertEqual(context.exception.code, 2)
+        self.assertIn(message, error_output.getvalue())
+
+    def test_profile_environment(self):
+        """Helpers: valid profiling environment variables are used
+        unless overridden by command line options
+        """
+        environment = dict(AOC_PROFILE="sample", AOC_PROFILE_TOP="5")
+        arguments = self.parse(environment)
+        self.assertEqual(arguments.profile, "sample")
+        self.assertEqual(arguments.profile_top, 5)
+        arguments = self.parse(
+            environment, "--profile", "cprofile", "--profile-top", "7"
+        )
+        self.assertEqual(arguments.profile, "cprofile")
+        self.assertEqual(arguments.profile_top, 7)
+
+    def test_invalid_profile_environment(self):
+        """Helpers: invalid profiling environment variables
+        produce usage errors
+        """
+        self.assert_usage_error(
+            dict(AOC_PROFILE="1"), "Invalid AOC_PROFILE value '1'"
+        )
+        self.assert_usage_error(
+            dict(AOC_PROFILE_TOP="x"), "Invalid AOC_PROFILE_TOP value 'x'"
+        )